@@ -0,0 +1,31 @@
+# Helpers of the budgeted Simulated Annealing, which derives it's temperatures from the instance instead of config.json
+# The acceptance rule of the Scheduler accepts a worse neighbour with probability exp(-delta / (temperature * current makespan)),
+# so the temperatures are calibrated on the relative deltas (delta / current makespan) of a sample of random moves
+import math
+from typing import List
+
+
+def calibrate_temperature(relative_deltas: List[float], acceptance: float) -> float:
+    # The temperature at which the worse moves of the sample are accepted with a mean probability of acceptance (between 0 and 1)
+    # The mean probability grows with the temperature, so we find it by bisection, on a log scale since the temperatures can be tiny
+    def mean_acceptance(temperature: float) -> float:
+        return sum(math.exp(-delta / temperature) for delta in relative_deltas) / len(relative_deltas)
+
+    low: float = 1e-12
+    high: float = 1.0
+    while mean_acceptance(high) < acceptance:     # The relative deltas are usually below 1, but we don't count on it
+        high *= 10
+    for _ in range(60):
+        middle: float = math.sqrt(low * high)
+        if mean_acceptance(middle) < acceptance:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def cooling_rate(initial_temperature: float, final_temperature: float, levels: int) -> float:
+    # The geometric cooling rate which goes from the initial to the final temperature in levels temperature levels
+    if levels <= 1:
+        return 1.0
+    return (final_temperature / initial_temperature) ** (1 / (levels - 1))
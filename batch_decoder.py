@@ -0,0 +1,58 @@
+# BatchDecoder evaluates many encoded solutions at once with NumPy
+# It steps through the sequence positions only once and processes all the candidates together at every position
+from itertools import chain
+from typing import List, Tuple
+
+import numpy as np
+
+from instance import CompiledInstance
+
+
+class BatchDecoder:
+    def __init__(self, instance: CompiledInstance):
+        self.instance: CompiledInstance = instance
+        self.durations: np.ndarray = np.asarray(instance.durations, dtype=np.int64)
+
+    def makespans(self, operation_sequences: np.ndarray, machine_assignments: np.ndarray) -> np.ndarray:
+        # operation_sequences has the shape (candidates, operations) and contains job ids like the operation_sequence lists
+        # machine_assignments has the shape (candidates, operations) and gives the machine of every global operation
+        # Returns the vector with the makespan of every candidate
+        num_candidates, sequence_length = operation_sequences.shape
+        num_machines: int = self.instance.num_machines
+        rows: np.ndarray = np.arange(num_candidates)
+
+        # Every job id appears exactly once for each of its operations, so after a stable sort of a sequence by job id the k-th
+        # element is the global operation k, this gives us the global operation of every position without walking the sequence
+        order: np.ndarray = np.argsort(operation_sequences, axis=1, kind='stable')
+        global_operations: np.ndarray = np.empty_like(order)
+        np.put_along_axis(global_operations, order, np.broadcast_to(np.arange(sequence_length), order.shape), axis=1)
+        # Now we can look up the machines and durations of all positions at once
+        machine_ids: np.ndarray = np.take_along_axis(machine_assignments, global_operations, axis=1)
+        position_durations: np.ndarray = self.durations[global_operations * num_machines + machine_ids]
+
+        # We work on flat buffers, with one row of machines/jobs per candidate, and transpose the index arrays so that
+        # the indexes of one position are contiguous in memory
+        machine_indexes: np.ndarray = np.ascontiguousarray((machine_ids + (rows * num_machines)[:, None]).T)
+        job_indexes: np.ndarray = np.ascontiguousarray((operation_sequences + (rows * self.instance.num_jobs)[:, None]).T)
+        position_durations = np.ascontiguousarray(position_durations.T)
+        machine_times: np.ndarray = np.zeros(num_candidates * num_machines, dtype=np.int64)
+        job_last_times: np.ndarray = np.zeros(num_candidates * self.instance.num_jobs, dtype=np.int64)
+
+        for position in range(sequence_length):
+            position_machines: np.ndarray = machine_indexes[position]
+            position_jobs: np.ndarray = job_indexes[position]
+            # Start when both the machine and the job are ready
+            end_times: np.ndarray = np.maximum(machine_times[position_machines], job_last_times[position_jobs]) + position_durations[position]
+            machine_times[position_machines] = end_times
+            job_last_times[position_jobs] = end_times
+
+        return machine_times.reshape(num_candidates, num_machines).max(axis=1)
+
+    def pack(self, solutions: List[Tuple[List[int], List[List[int]]]]) -> Tuple[np.ndarray, np.ndarray]:
+        # Converts a list of (operation_sequence, machine_assignment) solutions into the 2D arrays used by makespans()
+        operation_sequences: np.ndarray = np.array([solution[0] for solution in solutions], dtype=np.int64)
+        machine_assignments: np.ndarray = np.array([list(chain.from_iterable(solution[1])) for solution in solutions], dtype=np.int64)
+        return operation_sequences, machine_assignments
+
+    def evaluate(self, solutions: List[Tuple[List[int], List[List[int]]]]) -> List[int]:
+        return self.makespans(*self.pack(solutions)).tolist()
@@ -0,0 +1,120 @@
+# Benchmark suite, runs the algorithms on every instance of a directory and compares them with the best known makespans
+# The directory contains the instance files in the SchedulingLab format (https://github.com/SchedulingLab/fjsp-instances)
+# and a best_known.json file which maps every instance file name to its best known makespan, for example:
+#   { "mk01.txt": 40, "mk02.txt": 26 }
+# An instance kept somewhere else in the repo can be named by it's path relative to the directory (ex: "../dataset_github.txt"),
+# it's run like the files of the directory without making a copy of it
+# Instances without a best known makespan are still run, but they have no gap and no time to target
+import csv
+import json
+import math
+import os
+from typing import Dict, List, Optional
+
+from experiments import run_experiments
+
+METADATA_FILE: str = 'best_known.json'
+INSTANCE_EXTENSIONS = ('.txt', '.fjs')
+# The fields of the report, one row per (instance, algorithm)
+REPORT_FIELDS: List[str] = ['instance', 'algorithm', 'runs', 'best_known', 'best_makespan', 'mean_makespan', 'best_gap', 'mean_gap',
+                            'lower_bound', 'lower_bound_gap', 'target', 'target_hits', 'mean_time_to_target', 'evaluations_per_second']
+
+
+def load_best_known(directory: str) -> Dict[str, int]:
+    # The keys are the instance file names, or the paths relative to the directory of the instances which are outside of it
+    metadata_path: str = os.path.join(directory, METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r') as file:
+        return json.load(file)
+
+
+def list_instances(directory: str, best_known: Dict[str, int]) -> List[str]:
+    # The instance files of the directory and the ones named by a path in best_known.json
+    paths: List[str] = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(INSTANCE_EXTENSIONS)]
+    paths += [os.path.normpath(os.path.join(directory, name)) for name in best_known if os.path.dirname(name)]
+    return sorted(paths)
+
+
+def relative_gap(makespan: float, reference: Optional[int]) -> Optional[float]:
+    # The relative gap to the reference makespan (best known or lower bound), 0.05 means 5% worse
+    if not reference:
+        return None
+    return (makespan - reference) / reference
+
+
+# Runs the benchmark and returns the report rows, the raw runs are saved to results_path and the report to report_path
+# The target of the time to target is the best known makespan increased by target_gap (0 means reaching the best known makespan)
+def run_benchmark(directory: str, algorithms: List[str], repetitions: int, workers: int, master_seed: int, target_gap: float,
+                  results_path: str, report_path: str) -> List[Dict]:
+    metadata: Dict[str, int] = load_best_known(directory)
+    instance_paths: List[str] = list_instances(directory, metadata)
+    # The results name the instances by their file name, so the best known makespans too
+    best_known: Dict[str, int] = {os.path.basename(name): makespan for name, makespan in metadata.items()}
+    # The target is rounded up to a whole makespan, after rounding away the float error (100 * 1.07 is 107.00000000000001)
+    targets: Dict[str, int] = {
+        path: math.ceil(round(best_known[os.path.basename(path)] * (1 + target_gap), 6))
+        for path in instance_paths if os.path.basename(path) in best_known
+    }
+
+    results: List[Dict] = run_experiments(instance_paths, algorithms, repetitions, workers, master_seed, results_path, targets)
+    report: List[Dict] = make_report(results, best_known)
+    save_report(report, report_path)
+    print_report(report)
+    return report
+
+
+def make_report(results: List[Dict], best_known: Dict[str, int]) -> List[Dict]:
+    report: List[Dict] = []
+    instances: List[str] = list(dict.fromkeys(row['instance'] for row in results))
+    algorithms: List[str] = list(dict.fromkeys(row['algorithm'] for row in results))
+    for instance in instances:
+        for algorithm in algorithms:
+            rows: List[Dict] = [row for row in results if row['instance'] == instance and row['algorithm'] == algorithm]
+            if not rows:
+                continue
+            makespans: List[int] = [row['makespan'] for row in rows]
+            times_to_target: List[float] = [row['time_to_target'] for row in rows if row['time_to_target'] is not None]
+            total_time: float = sum(row['wall_time'] for row in rows)
+            mean_makespan: float = sum(makespans) / len(makespans)
+            report.append({
+                'instance': instance,
+                'algorithm': algorithm,
+                'runs': len(rows),
+                'best_known': best_known.get(instance),
+                'best_makespan': min(makespans),
+                'mean_makespan': mean_makespan,
+                'best_gap': relative_gap(min(makespans), best_known.get(instance)),
+                'mean_gap': relative_gap(mean_makespan, best_known.get(instance)),
+                'lower_bound': rows[0]['lower_bound'],
+                'lower_bound_gap': relative_gap(min(makespans), rows[0]['lower_bound']),    # 0 means the best makespan is optimal
+                'target': rows[0]['target'],
+                'target_hits': len(times_to_target),
+                'mean_time_to_target': sum(times_to_target) / len(times_to_target) if times_to_target else None,
+                'evaluations_per_second': sum(row['evaluations'] for row in rows) / total_time if total_time > 0 else None
+            })
+    return report
+
+
+def save_report(report: List[Dict], report_path: str) -> None:
+    directory: str = os.path.dirname(report_path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    with open(report_path, 'w', newline = '') as file:
+        writer = csv.DictWriter(file, fieldnames = REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(report)
+
+
+def print_report(report: List[Dict]) -> None:
+    def show(value, pattern: str) -> str:
+        return pattern.format(value) if value is not None else '-'
+
+    print(f'{"Instance":<20} {"Algorithm":<10} {"Best":>8} {"Mean":>10} {"BKS":>8} {"Gap":>8} {"Mean gap":>9} {"LB":>8} {"LB gap":>8} '
+          f'{"Hits":>6} {"TTT (s)":>9} {"Eval/s":>10}')
+    for row in report:
+        print(f'{row["instance"]:<20} {row["algorithm"]:<10} {row["best_makespan"]:>8} {row["mean_makespan"]:>10.1f} '
+              f'{show(row["best_known"], "{}"):>8} {show(row["best_gap"], "{:.2%}"):>8} {show(row["mean_gap"], "{:.2%}"):>9} '
+              f'{row["lower_bound"]:>8} {show(row["lower_bound_gap"], "{:.2%}"):>8} '
+              f'{row["target_hits"]:>3}/{row["runs"]:<2} {show(row["mean_time_to_target"], "{:.3f}"):>9} '
+              f'{show(row["evaluations_per_second"], "{:.0f}"):>10}')
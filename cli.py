@@ -0,0 +1,198 @@
+# Command line entry point of the solver, one subcommand for every use:
+#   python cli.py solve dataset_github.txt -a TS ILS --seed 42       runs the algorithms and prints the makespans, nothing is plotted
+#   python cli.py gantt dataset_github.txt -a MWR                     runs the algorithms and shows their Gantt charts
+#   python cli.py compare dataset_github.txt -a SA TS -r 10           runs the experiment and saves the charts of the results
+#   python cli.py benchmark benchmarks                                runs the benchmark suite and prints the report
+#   python cli.py tune -a SA -p cooling_rate=0.9,0.99 -p restarts=5,20   races the parameter configurations and prints the ranking
+# Without -a the algorithms are read from schedule_algorithms.txt (solve, gantt) or compare_algorithms.txt (compare, benchmark),
+# the other options default to config.json
+# The modules are imported by the subcommands which need them, so a headless solve doesn't import the plotting libraries
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from config_loader import config
+
+# This is the dictionaire for the heuristic names
+HEURISTIC_NAMES: Dict[str, str] = {
+    'SPT'   : 'Shortest Processing Time',
+    'LPT'   : 'Longest Processing Time',
+    'MWR'   : 'Most Work Remaining',
+    'LWR'   : 'Least Work Remaining',
+    'SA'    : 'Simulated Annealing',
+    'HC'    : 'Hill Climber',
+    'TS'    : 'Tabu Search',
+    'GA'    : 'Genetic Algorithm',
+    'ILS'   : 'Iterated Local Search'
+}
+
+
+def read_algorithms(path: str) -> List[str]:
+    # The algorithms of the last line of the file, separated by spaces
+    heuristics: List[str] = []
+    with open(path, 'r') as file:
+        #read by lines
+        for line in file:
+            heuristics = line.split()
+    return heuristics
+
+
+def solve(arguments: argparse.Namespace) -> None:
+    from scheduler import Scheduler
+
+    scheduler: Scheduler = Scheduler.from_file(arguments.instance)
+    print(f'{arguments.instance}: {scheduler.instance.num_jobs} jobs, {scheduler.instance.num_machines} machines, '
+          f'lower bound {scheduler.lower_bound}')
+    for heuristic in arguments.algorithms or read_algorithms('schedule_algorithms.txt'):
+        if arguments.seed is not None:
+            random.seed(arguments.seed)     # Every algorithm gets the same seed, so it doesn't depend on the ones before it
+        started: float = time.perf_counter()
+        scheduler.run(heuristic, time_limit = arguments.time_limit, evaluation_limit = arguments.evaluation_limit)
+        print(f'{heuristic:<4} makespan: {scheduler.get_makespan():>8}   evaluations: {scheduler.monitor.evaluations:>9}   '
+              f'time: {time.perf_counter() - started:.2f} s')
+        if arguments.schedule:
+            scheduler.print_job_answer()
+        scheduler.reset_scheduler()
+
+
+def gantt(arguments: argparse.Namespace) -> None:
+    from scheduler import Scheduler
+    from utils import run_gannt_chart
+
+    scheduler: Scheduler = Scheduler.from_file(arguments.instance)
+    for heuristic in arguments.algorithms or read_algorithms('schedule_algorithms.txt'):
+        if arguments.seed is not None:
+            random.seed(arguments.seed)
+        run_gannt_chart(heuristic, scheduler, HEURISTIC_NAMES)
+
+
+def compare(arguments: argparse.Namespace) -> None:
+    from experiments import run_experiments
+
+    # Every algorithm is run repetitions times on every instance, the results are saved to a file and the charts are made from that file
+    results_file: str = arguments.results or config.experiments.results_file
+    trace_file: Optional[str] = arguments.trace or config.experiments.trace_file
+    results: List[Dict] = run_experiments(arguments.instances or config.experiments.instances,
+                                          arguments.algorithms or read_algorithms('compare_algorithms.txt'),
+                                          arguments.repetitions or config.experiments.repetitions,
+                                          arguments.workers or config.experiments.workers,
+                                          arguments.seed if arguments.seed is not None else config.experiments.seed, results_file,
+                                          instrument = config.experiments.instrument, trace_memory = config.experiments.trace_memory,
+                                          trace_path = trace_file)
+    if arguments.no_charts:
+        return
+
+    from utils import save_convergence_charts, save_results_charts, save_stats_charts
+    save_results_charts(results_file, HEURISTIC_NAMES)
+    if config.experiments.instrument:
+        save_stats_charts(results_file, HEURISTIC_NAMES)
+    if trace_file:
+        save_convergence_charts(trace_file, HEURISTIC_NAMES, lower_bounds = {row['instance']: row['lower_bound'] for row in results})
+
+
+def benchmark(arguments: argparse.Namespace) -> None:
+    from benchmark_suite import run_benchmark
+
+    # Runs every algorithm on every instance of the benchmark directory and prints the gaps to the best known makespans
+    run_benchmark(arguments.directory or config.benchmarks.directory, arguments.algorithms or read_algorithms('compare_algorithms.txt'),
+                  arguments.repetitions or config.benchmarks.repetitions, arguments.workers or config.benchmarks.workers,
+                  arguments.seed if arguments.seed is not None else config.benchmarks.seed, config.benchmarks.target_gap,
+                  config.benchmarks.results_file, config.benchmarks.report_file)
+
+
+def parse_grid(values: List[str]) -> Dict[str, List[Any]]:
+    # NAME=VALUE,VALUE,... becomes {NAME: [VALUE, VALUE, ...]}, the values are read as JSON (numbers, true/false, null), the others are strings
+    grid: Dict[str, List[Any]] = {}
+    for value in values:
+        name, _, choices = value.partition('=')
+        if not choices:
+            raise argparse.ArgumentTypeError(f'expected NAME=VALUE,VALUE,... got {value}')
+        grid[name] = []
+        for choice in choices.split(','):
+            try:
+                grid[name].append(json.loads(choice))
+            except json.JSONDecodeError:
+                grid[name].append(choice)
+    return grid
+
+
+def tune(arguments: argparse.Namespace) -> None:
+    from scheduler import default_params
+    from tuning import parameter_grid, print_tuning, save_tuning, tune as race
+
+    settings = config.tuning
+    algorithm: str = arguments.algorithm or settings.algorithm
+    # The grid of config.json is made for tuning.algorithm, another algorithm needs it's own values
+    if not arguments.param and algorithm != settings.algorithm:
+        raise SystemExit(f'The grid of config.json is for {settings.algorithm}, give the values tried for {algorithm} with -p NAME=VALUE,VALUE')
+    grid: Dict[str, List[Any]] = parse_grid(arguments.param) if arguments.param else settings.grid
+    candidates = parameter_grid(default_params(algorithm), grid)
+    ranking: List[Dict] = race(algorithm, candidates, arguments.instances or settings.instances, arguments.rounds or settings.rounds,
+                               arguments.workers or settings.workers, arguments.seed if arguments.seed is not None else settings.seed,
+                               settings.keep_fraction, arguments.evaluation_limit or settings.evaluation_limit)
+    results_file: str = arguments.results or settings.results_file
+    save_tuning(ranking, results_file)
+    print(f'Ranking saved to {results_file}')
+    print_tuning(ranking, grid)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description = 'Flexible Job Shop Scheduling solver')
+    subcommands = parser.add_subparsers(dest = 'command', required = True)
+
+    # The options shared by all the subcommands
+    common = argparse.ArgumentParser(add_help = False)
+    common.add_argument('-a', '--algorithms', nargs = '+', choices = list(HEURISTIC_NAMES), metavar = 'ALGORITHM',
+                        help = f'algorithms to run ({" ".join(HEURISTIC_NAMES)})')
+    common.add_argument('--seed', type = int, help = 'seed of the random generator')
+
+    solve_parser = subcommands.add_parser('solve', parents = [common], help = 'run the algorithms and print the makespans')
+    solve_parser.add_argument('instance', help = 'instance file')
+    solve_parser.add_argument('--time-limit', type = float, help = 'seconds every algorithm can run')
+    solve_parser.add_argument('--evaluation-limit', type = int, help = 'evaluations every algorithm can do')
+    solve_parser.add_argument('--schedule', action = 'store_true', help = 'also print the schedule of every job')
+    solve_parser.set_defaults(handler = solve)
+
+    gantt_parser = subcommands.add_parser('gantt', parents = [common], help = 'run the algorithms and show their Gantt charts')
+    gantt_parser.add_argument('instance', help = 'instance file')
+    gantt_parser.set_defaults(handler = gantt)
+
+    compare_parser = subcommands.add_parser('compare', parents = [common], help = 'compare the algorithms over repeated runs')
+    compare_parser.add_argument('instances', nargs = '*', help = 'instance files (default: experiments.instances)')
+    compare_parser.add_argument('-r', '--repetitions', type = int, help = 'runs of every algorithm on every instance')
+    compare_parser.add_argument('-w', '--workers', type = int, help = 'worker processes')
+    compare_parser.add_argument('--results', help = 'results file (.csv or .json)')
+    compare_parser.add_argument('--trace', help = 'JSONL file for the convergence traces')
+    compare_parser.add_argument('--no-charts', action = 'store_true', help = 'only save the results')
+    compare_parser.set_defaults(handler = compare)
+
+    benchmark_parser = subcommands.add_parser('benchmark', parents = [common], help = 'run the benchmark suite on a directory of instances')
+    benchmark_parser.add_argument('directory', nargs = '?', help = 'directory of the instances (default: benchmarks.directory)')
+    benchmark_parser.add_argument('-r', '--repetitions', type = int, help = 'runs of every algorithm on every instance')
+    benchmark_parser.add_argument('-w', '--workers', type = int, help = 'worker processes')
+    benchmark_parser.set_defaults(handler = benchmark)
+
+    tune_parser = subcommands.add_parser('tune', help = 'race parameter configurations of a heuristic and drop the poor ones early')
+    tune_parser.add_argument('instances', nargs = '*', help = 'instance files (default: tuning.instances)')
+    tune_parser.add_argument('-a', '--algorithm', choices = ['SA', 'HC', 'TS', 'GA', 'ILS'], help = 'heuristic to tune')
+    tune_parser.add_argument('-p', '--param', action = 'append', metavar = 'NAME=VALUE,VALUE',
+                             help = 'values tried for a parameter, can be repeated (default: tuning.grid)')
+    tune_parser.add_argument('--rounds', type = int, help = 'maximum number of rounds')
+    tune_parser.add_argument('--evaluation-limit', type = int, help = 'evaluations of every run')
+    tune_parser.add_argument('-w', '--workers', type = int, help = 'worker processes')
+    tune_parser.add_argument('--seed', type = int, help = 'master seed')
+    tune_parser.add_argument('--results', help = 'CSV file for the ranking')
+    tune_parser.set_defaults(handler = tune)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arguments: argparse.Namespace = build_parser().parse_args(argv)
+    arguments.handler(arguments)
+
+
+# The guard is needed because the worker processes of the experiment runner import this module
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,268 @@
 # Define classes to provide type hints for the config structure
-class GlobalConfigs:
+# Every section is also a validated object: it's built from the values of the JSON (or from keyword arguments), the types and ranges
+# are checked when it's built, and replace() gives a copy with some values changed. The sections of the heuristics are the parameters
+# of their runs, so a run can use other values than config.json (ex: scheduler.run('SA', params = config.simulated_annealing.replace(restarts = 5)))
+# The fields added after the first version of config.json have a default which behaves like before they existed, so an older config
+# file still works, only the unknown fields and the wrong values are rejected. The sections with a default of {} are built from the
+# defaults of their fields when they're missing
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+NEIGHBORHOODS: Tuple[str, ...] = ('random', 'critical')
+DECODERS: Tuple[str, ...] = ('semi_active', 'active')           # The same as decoder.DECODERS
+MIGRATION_TOPOLOGIES: Tuple[str, ...] = ('ring', 'fully_connected')
+ANNEALING_MODES: Tuple[str, ...] = ('restarts', 'tempering', 'budget')
+CLIMBING_MODES: Tuple[str, ...] = ('sampled', 'first_improvement', 'best_improvement')
+
+
+class ConfigSection:
+    CHOICES = {}        # The allowed values of the string fields (not annotated, so it's not a field)
+
+    def __init__(self, **values: Any):
+        fields: Dict[str, Any] = get_type_hints(type(self))
+        unknown: List[str] = [name for name in values if name not in fields]
+        missing: List[str] = [name for name in fields if name not in values and not hasattr(type(self), name)]
+        if unknown:
+            raise ValueError(f'{type(self).__name__}: unknown parameter(s) {", ".join(unknown)}')
+        if missing:
+            raise ValueError(f'{type(self).__name__}: missing parameter(s) {", ".join(missing)}')
+        for name, hint in fields.items():
+            # The lists, dicts and sections are rebuilt by _convert(), so the instances never share the default of the class
+            value: Any = values[name] if name in values else getattr(type(self), name)
+            setattr(self, name, _convert(f'{type(self).__name__}.{name}', value, hint))
+        self.validate()
+
+    def validate(self) -> None:
+        # Checks the values which are not only a matter of type, the sections add their ranges
+        for name, choices in self.CHOICES.items():
+            self._check(getattr(self, name) in choices, f'{name} must be one of {", ".join(choices)}')
+
+    def _check(self, condition: bool, message: str) -> None:
+        if not condition:
+            raise ValueError(f'{type(self).__name__}: {message}')
+
+    def replace(self, **changes: Any) -> 'ConfigSection':
+        # A validated copy with some values changed, the section itself is not modified
+        return type(self)(**dict(self.as_dict(), **changes))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in get_type_hints(type(self))}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({", ".join(f"{name}={value!r}" for name, value in self.as_dict().items())})'
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+
+def _convert(name: str, value: Any, hint: Any) -> Any:
+    # Checks the value against the type hint of the field, ints are accepted for floats and the nested sections are built from dicts
+    origin = get_origin(hint)
+    if origin is Union:     # Optional[...]
+        if value is None:
+            return None
+        return _convert(name, value, next(argument for argument in get_args(hint) if argument is not type(None)))
+    if origin is list:
+        if not isinstance(value, list):
+            raise TypeError(f'{name} must be a list')
+        return [_convert(name, item, get_args(hint)[0]) for item in value]
+    if origin is dict:
+        if not isinstance(value, dict):
+            raise TypeError(f'{name} must be an object')
+        return {key: _convert(f'{name}.{key}', item, get_args(hint)[1]) for key, item in value.items()}
+    if hint is Any:
+        return value
+    if isinstance(hint, type) and issubclass(hint, ConfigSection):
+        if isinstance(value, hint):
+            return value
+        if not isinstance(value, dict):
+            raise TypeError(f'{name} must be an object')
+        return hint(**value)
+    if hint is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, hint) or (hint is int and isinstance(value, bool)):
+        raise TypeError(f'{name} must be {hint.__name__}, got {value!r}')
+    return value
+
+
+class GlobalConfigs(ConfigSection):
     operation_machine_ratio: float
+    batch_threshold: int = 48
+    workers: int = 1        # Number of worker processes, 1 runs everything in the current process
+    seed: Optional[int] = None    # Master seed of the parallel runs, null picks a random one
+    decoder: str = 'semi_active'    # 'semi_active' (operations appended to their machine) or 'active' (inserted in the earliest idle gap)
+    cache_size: int = 0     # Maximum number of makespans kept by the evaluation cache, 0 disables it
+    time_limit: Optional[float] = None    # Seconds a heuristic can run, null for no limit
+    evaluation_limit: Optional[int] = None    # Evaluations a heuristic can do, null for no limit
+    stagnation_limit: Optional[int] = None    # Evaluations without improvement after which a heuristic stops, null for no limit
+    instance_cache: bool = False    # Keep the parsed instances in a binary cache next to the files (needs NumPy)
+
+    CHOICES = {'decoder': DECODERS}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(0 <= self.operation_machine_ratio <= 1, 'operation_machine_ratio must be between 0 and 1')
+        self._check(self.batch_threshold >= 1, 'batch_threshold must be at least 1')
+        self._check(self.workers >= 1, 'workers must be at least 1')
+        self._check(self.cache_size >= 0, 'cache_size must be 0 or more')
+        for name in ('time_limit', 'evaluation_limit', 'stagnation_limit'):
+            self._check(getattr(self, name) is None or getattr(self, name) >= 0, f'{name} must be null or 0 or more')
 
-class SimulatedAnnealingConfig:
+class SimulatedAnnealingConfig(ConfigSection):
     initial_temperature: float
     cooling_rate: float
     min_temperature: float
     max_iterations: int
     restarts: int
+    mode: str = 'restarts'    # 'restarts' (independent cooling chains), 'tempering' (replicas at fixed temperatures which exchange states)
+                            # or 'budget' (one chain cooled over evaluation_budget evaluations)
+    replicas: int = 8       # Number of replicas of parallel tempering, their temperatures are spaced geometrically on the ladder
+    tempering_min_temperature: float = 0.0002    # Temperature of the coldest replica, relative to the makespan like the other temperatures
+    tempering_max_temperature: float = 0.02    # Temperature of the hottest replica
+    exchange_interval: int = 50    # Moves of every replica between two exchanges
+    evaluation_budget: int = 50000    # Evaluations of the 'budget' mode, the evaluation limit of the run when it's smaller
+    chain_length: int = 100    # Moves at every temperature of the 'budget' mode
+    initial_acceptance: float = 0.5    # Mean acceptance probability of the worse moves at the first temperature of the 'budget' mode
+    final_acceptance: float = 0.001    # The same at the last temperature
+    calibration_samples: int = 200    # Random moves evaluated to calibrate the temperatures, they are part of the budget
 
-class HillClimbingConfig:
+    CHOICES = {'mode': ANNEALING_MODES}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.initial_temperature > 0, 'initial_temperature must be positive')
+        self._check(0 < self.cooling_rate < 1, 'cooling_rate must be between 0 and 1')
+        self._check(self.min_temperature >= 0, 'min_temperature must be 0 or more')
+        self._check(self.max_iterations >= 0, 'max_iterations must be 0 or more')
+        self._check(self.restarts >= 1, 'restarts must be at least 1')
+        self._check(self.replicas >= 2, 'replicas must be at least 2')
+        self._check(self.exchange_interval >= 1, 'exchange_interval must be at least 1')
+        self._check(self.evaluation_budget >= 1, 'evaluation_budget must be at least 1')
+        self._check(self.chain_length >= 1, 'chain_length must be at least 1')
+        self._check(0 < self.final_acceptance < self.initial_acceptance < 1, 'the acceptances must be 0 < final_acceptance < initial_acceptance < 1')
+        self._check(self.calibration_samples >= 1, 'calibration_samples must be at least 1')
+        # The temperatures of the ladder are spaced geometrically, so the coldest one can't be 0
+        self._check(0 < self.tempering_min_temperature < self.tempering_max_temperature,
+                    'tempering needs 0 < tempering_min_temperature < tempering_max_temperature')
+
+class HillClimbingConfig(ConfigSection):
     max_iterations: int
     improvement_tries: int
     restarts: int
     neighbors_number: int
+    neighborhood: str = 'random'    # 'random' neighbours or the 'critical' path neighbourhood
+    mode: str = 'sampled'    # 'sampled' (neighbors_number neighbours at every iteration) or the systematic 'first_improvement' and
+                            # 'best_improvement', which enumerate all the swaps and reassignments and stop at a local optimum
+    dont_look_bits: bool = True    # The systematic modes skip the positions whose moves didn't improve until a move touches them again
+
+    CHOICES = {'neighborhood': NEIGHBORHOODS, 'mode': CLIMBING_MODES}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.max_iterations >= 0, 'max_iterations must be 0 or more')
+        self._check(self.improvement_tries >= 1, 'improvement_tries must be at least 1')
+        self._check(self.restarts >= 1, 'restarts must be at least 1')
+        self._check(self.neighbors_number >= 1, 'neighbors_number must be at least 1')
 
-class TabuSearchConfig:
+class TabuSearchConfig(ConfigSection):
     tabu_tenure: int
     max_iterations: int
+    neighborhood: str = 'random'    # 'random' neighbours or the 'critical' path neighbourhood
+    candidate_list_size: int = 15    # Number of random neighbours evaluated at every iteration
 
-class GeneticAlgorithmConfig:
-    population_size: int
+    CHOICES = {'neighborhood': NEIGHBORHOODS}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.tabu_tenure >= 0, 'tabu_tenure must be 0 or more')
+        self._check(self.max_iterations >= 0, 'max_iterations must be 0 or more')
+        self._check(self.candidate_list_size >= 1, 'candidate_list_size must be at least 1')
+
+class GeneticAlgorithmConfig(ConfigSection):
+    population_size: int        # At least 2, we need 2 parents
     num_generations: int
     crossover_rate: float
     mutation_rate: float
     tournament_size: int
+    islands: int = 1        # Number of sub-populations evolved in separate processes, 1 disables the island model
+    migration_interval: int = 10    # Generations between two migrations
+    migrants: int = 2       # Number of elite individuals sent by every island
+    migration_topology: str = 'ring'    # 'ring' or 'fully_connected'
+
+    CHOICES = {'migration_topology': MIGRATION_TOPOLOGIES}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.population_size >= 2, 'population_size must be at least 2')
+        self._check(self.num_generations >= 0, 'num_generations must be 0 or more')
+        self._check(0 <= self.crossover_rate <= 1, 'crossover_rate must be between 0 and 1')
+        self._check(0 <= self.mutation_rate <= 1, 'mutation_rate must be between 0 and 1')
+        self._check(self.tournament_size >= 1, 'tournament_size must be at least 1')
+        self._check(self.tournament_size <= self.population_size, 'tournament_size must be at most population_size')
+        self._check(self.islands >= 1, 'islands must be at least 1')
+        self._check(self.migration_interval >= 1, 'migration_interval must be at least 1')
+        self._check(self.migrants >= 0, 'migrants must be 0 or more')
 
-class IteratedLocalSearch:
+class IteratedLocalSearch(ConfigSection):
     max_iterations: int
     perturbation_strength: int
     improvement_tries: int
+    neighborhood: str = 'random'    # 'random' neighbours or the 'critical' path neighbourhood
+
+    CHOICES = {'neighborhood': NEIGHBORHOODS}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.max_iterations >= 0, 'max_iterations must be 0 or more')
+        self._check(self.perturbation_strength >= 0, 'perturbation_strength must be 0 or more')
+        self._check(self.improvement_tries >= 1, 'improvement_tries must be at least 1')
+
+class ExperimentsConfig(ConfigSection):
+    instances: List[str] = ['dataset_github.txt']    # Instance files used by main_compare.py
+    repetitions: int = 10    # Runs of every algorithm on every instance
+    workers: int = 1        # Number of processes running the experiment grid
+    seed: int = 0           # Master seed, the seed of every run is derived from it
+    results_file: str = 'results/compare_results.csv'    # .csv or .json file where the results of the runs are saved
+    instrument: bool = False    # Saves the call counts and phase times of every run and charts them
+    trace_memory: bool = False    # Also samples the peak memory of every run (much slower)
+    trace_file: Optional[str] = None    # JSONL file receiving every new best makespan of the runs, null disables the traces
+
+class BenchmarksConfig(ConfigSection):
+    directory: str = 'benchmarks'    # Directory with the instance files and their best_known.json
+    repetitions: int = 5    # Runs of every algorithm on every instance
+    workers: int = 1        # Number of processes running the benchmark
+    seed: int = 0           # Master seed, the seed of every run is derived from it
+    target_gap: float = 0.05    # The target of the time to target is the best known makespan increased by this ratio
+    results_file: str = 'results/benchmark_runs.csv'    # File with every run
+    report_file: str = 'results/benchmark_report.csv'    # File with the report, one row per instance and algorithm
+
+class TuningConfig(ConfigSection):
+    algorithm: str = 'SA'    # The heuristic whose parameters are tuned
+    instances: List[str] = ['dataset_github.txt']    # Instance files the configurations are raced on
+    # The values tried for every tuned parameter, the other parameters are the ones of the heuristic's section
+    grid: Dict[str, List[Any]] = {'initial_temperature': [0.1, 1, 1000], 'cooling_rate': [0.9, 0.99, 0.999], 'max_iterations': [5000, 50000]}
+    rounds: int = 4         # Maximum number of rounds, every round runs the remaining configurations once on every instance
+    keep_fraction: float = 0.5    # Part of the configurations kept after every round
+    evaluation_limit: Optional[int] = 20000    # Evaluations of every run, the same budget for all the configurations
+    workers: int = 1        # Number of processes running the rounds
+    seed: int = 0           # Master seed, the seed of every run is derived from it
+    results_file: str = 'results/tuning.csv'    # File with the ranking of the configurations
+
+    CHOICES = {'algorithm': ('SA', 'HC', 'TS', 'GA', 'ILS')}
+
+    def validate(self) -> None:
+        super().validate()
+        self._check(self.rounds >= 1, 'rounds must be at least 1')
+        self._check(0 < self.keep_fraction < 1, 'keep_fraction must be between 0 and 1')
+        self._check(self.workers >= 1, 'workers must be at least 1')
+        self._check(self.evaluation_limit is None or self.evaluation_limit >= 1, 'evaluation_limit must be null or at least 1')
 
-class Config:
+class Config(ConfigSection):
     simulated_annealing: SimulatedAnnealingConfig
     hill_climbing: HillClimbingConfig
     tabu_search: TabuSearchConfig
     genetic_algorithm: GeneticAlgorithmConfig
     iterated_local_search: IteratedLocalSearch
-    global_configs: GlobalConfigs
\ No newline at end of file
+    global_configs: GlobalConfigs
+    experiments: ExperimentsConfig = {}
+    benchmarks: BenchmarksConfig = {}
+    tuning: TuningConfig = {}
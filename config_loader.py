@@ -1,36 +1,50 @@
 ### Getting the config data part ###
-# Function to recursively convert a dictionary to a SimpleNamespace object (We use it below for getting the config file)
+# The config file is read the first time a value is used (not when the module is imported) and it's validated by the section classes
+# of configModels.py, so a wrong type or value fails at the start with the name of the field. The heuristics only use it for the
+# default values of their parameters, every run can get it's own parameter objects (see configModels.ConfigSection.replace())
 import json
-from types import SimpleNamespace
-from typing import Dict
+from typing import Optional
 
 from configModels import Config
 
+CONFIG_PATH: str = 'config.json'
 
-def convert_to_namespace(data):
-    if isinstance(data, dict):
-        # Create a new dictionary where each value is recursively converted
-        converted_dict: Dict = {}
-        for key, value in data.items():
-            converted_dict[key] = convert_to_namespace(value)
-            
-        return SimpleNamespace(**converted_dict)
-    
-    # If the input is not a dictionary, return it unchanged
-    return data
-
-# Load the configuration from the JSON file
-try:
-    with open('config.json', 'r') as config_file:
-        # Parse the JSON file into a Python dictionary
-        config_dict = json.load(config_file)
-    
-    # Convert the dictionary to a SimpleNamespace object for dot notation
-    config: Config = convert_to_namespace(config_dict)
-
-except FileNotFoundError:
-    print("Error: The file 'config.json' was not found.")
-    raise
-except json.JSONDecodeError:
-    print("Error: The 'config.json' file contains invalid JSON.")
-    raise
\ No newline at end of file
+_loaded_config: Optional[Config] = None     # The config read from CONFIG_PATH, None until it's first used
+
+
+def load_config(path: str = CONFIG_PATH) -> Config:
+    # Reads and validates a config file
+    try:
+        with open(path, 'r') as config_file:
+            # Parse the JSON file into a Python dictionary
+            config_dict = json.load(config_file)
+    except FileNotFoundError:
+        print(f"Error: The file '{path}' was not found.")
+        raise
+    except json.JSONDecodeError:
+        print(f"Error: The '{path}' file contains invalid JSON.")
+        raise
+    # The dictionary becomes the section objects, which are used with dot notation
+    return Config(**config_dict)
+
+
+def get_config() -> Config:
+    global _loaded_config
+    if _loaded_config is None:
+        _loaded_config = load_config()
+    return _loaded_config
+
+
+def set_config(new_config: Config) -> None:
+    # Replaces the config of the current process, ex: a config read from another file
+    global _loaded_config
+    _loaded_config = new_config
+
+
+class _LazyConfig:
+    # Reads the config on the first access, config.simulated_annealing is get_config().simulated_annealing
+    def __getattr__(self, name: str):
+        return getattr(get_config(), name)
+
+
+config: Config = _LazyConfig()
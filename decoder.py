@@ -0,0 +1,303 @@
+# Decoder turns an encoded solution (operation sequence + machine assignment) into a makespan or a schedule
+# It only reads the CompiledInstance, so it never touches the Scheduler, Job or Machine objects
+import math
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Union
+
+from instance import CompiledInstance
+
+
+class Decoder:
+    # Every thread/process should use it's own Decoder since the buffers are reused between calls,
+    # the CompiledInstance can be shared between all of them because it's read only
+    def __init__(self, instance: CompiledInstance):
+        self.instance: CompiledInstance = instance
+        # Preallocated integer buffers, reset at the beginning of every decoding
+        self.job_last_times: List[int] = [0] * instance.num_jobs        # When each job's last operation finished
+        self.machine_times: List[int] = [0] * instance.num_machines     # When each machine becomes available
+        self.scheduled_tasks: List[int] = [0] * instance.num_jobs       # Number of operations already scheduled per job
+        self._zero_jobs: List[int] = [0] * instance.num_jobs
+        self._zero_machines: List[int] = [0] * instance.num_machines
+
+    def makespan(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        # Returns only the makespan of the solution, nothing else is written
+        job_last_times: List[int] = self.job_last_times
+        machine_times: List[int] = self.machine_times
+        scheduled_tasks: List[int] = self.scheduled_tasks
+        job_last_times[:] = self._zero_jobs
+        machine_times[:] = self._zero_machines
+        scheduled_tasks[:] = self._zero_jobs
+
+        job_offsets: List[int] = self.instance.job_offsets
+        durations: List[int] = self.instance.durations
+        num_machines: int = self.instance.num_machines
+
+        for job_id in operation_sequence:
+            operation_index: int = scheduled_tasks[job_id]
+            global_operation: int = job_offsets[job_id] + operation_index
+            if global_operation < job_offsets[job_id + 1]:
+                machine_id: int = machine_assignment[job_id][operation_index]
+                # Start when both the machine and the job are ready
+                start_time: int = machine_times[machine_id]
+                if job_last_times[job_id] > start_time:
+                    start_time = job_last_times[job_id]
+                end_time: int = start_time + durations[global_operation * num_machines + machine_id]
+                machine_times[machine_id] = end_time
+                job_last_times[job_id] = end_time
+                scheduled_tasks[job_id] = operation_index + 1
+
+        return max(machine_times)
+
+    def schedule(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> List[Tuple[int, int, int, int, int]]:
+        # Decodes the solution in the same way as makespan() but returns every scheduled operation
+        # in the format (job_id, operation_index, machine_id, start_time, end_time), in the order they were scheduled
+        job_last_times: List[int] = [0] * self.instance.num_jobs
+        machine_times: List[int] = [0] * self.instance.num_machines
+        scheduled_tasks: List[int] = [0] * self.instance.num_jobs
+        job_offsets: List[int] = self.instance.job_offsets
+        durations: List[int] = self.instance.durations
+        num_machines: int = self.instance.num_machines
+        scheduled: List[Tuple[int, int, int, int, int]] = []
+
+        for job_id in operation_sequence:
+            operation_index: int = scheduled_tasks[job_id]
+            global_operation: int = job_offsets[job_id] + operation_index
+            if global_operation < job_offsets[job_id + 1]:
+                machine_id: int = machine_assignment[job_id][operation_index]
+                start_time: int = max(machine_times[machine_id], job_last_times[job_id])
+                end_time: int = start_time + durations[global_operation * num_machines + machine_id]
+                machine_times[machine_id] = end_time
+                job_last_times[job_id] = end_time
+                scheduled_tasks[job_id] = operation_index + 1
+                scheduled.append((job_id, operation_index, machine_id, start_time, end_time))
+
+        return scheduled
+
+
+# ActiveDecoder decodes the solutions into active schedules: every operation is placed in the earliest idle gap of its machine where it fits
+# after the previous operation of the job, and only after the last operation of the machine if no gap is big enough.
+# For the same solution the schedule is usually much shorter than the semi-active one of Decoder, but the order of the operations
+# on a machine is not the order of the operation sequence anymore
+class ActiveDecoder:
+    def __init__(self, instance: CompiledInstance):
+        self.instance: CompiledInstance = instance
+        # Gaps shorter than the shortest operation can't be used by any operation, so we don't keep them
+        self.min_gap: int = max(1, min(instance.min_durations, default = 1))
+
+    def makespan(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        return self._decode(operation_sequence, machine_assignment, None)
+
+    def schedule(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> List[Tuple[int, int, int, int, int]]:
+        # Same format as Decoder.schedule(), but sorted by the start times since an operation can be placed before the ones decoded earlier
+        scheduled: List[Tuple[int, int, int, int, int]] = []
+        self._decode(operation_sequence, machine_assignment, scheduled)
+        scheduled.sort(key = lambda operation: operation[3])
+        return scheduled
+
+    def _decode(self, operation_sequence: List[int], machine_assignment: List[List[int]],
+                scheduled: Optional[List[Tuple[int, int, int, int, int]]]) -> int:
+        num_machines: int = self.instance.num_machines
+        job_offsets: List[int] = self.instance.job_offsets
+        durations: List[int] = self.instance.durations
+        min_gap: int = self.min_gap
+        machine_times: List[int] = [0] * num_machines               # When each machine finishes it's last operation
+        job_last_times: List[int] = [0] * self.instance.num_jobs
+        scheduled_tasks: List[int] = [0] * self.instance.num_jobs
+        # The idle gaps [gap_starts[m][g], gap_ends[m][g]) of every machine before machine_times[m], sorted by time
+        # The gaps don't overlap, so the ends are sorted too and we can binary search the first gap that ends after the job is ready
+        gap_starts: List[List[int]] = [[] for _ in range(num_machines)]
+        gap_ends: List[List[int]] = [[] for _ in range(num_machines)]
+
+        for job_id in operation_sequence:
+            operation_index: int = scheduled_tasks[job_id]
+            global_operation: int = job_offsets[job_id] + operation_index
+            if global_operation >= job_offsets[job_id + 1]:
+                continue
+            machine_id: int = machine_assignment[job_id][operation_index]
+            duration: int = durations[global_operation * num_machines + machine_id]
+            ready_time: int = job_last_times[job_id]
+            starts: List[int] = gap_starts[machine_id]
+            ends: List[int] = gap_ends[machine_id]
+
+            start_time: int = -1
+            gap: int = bisect_right(ends, ready_time)
+            while gap < len(ends):
+                candidate: int = starts[gap] if starts[gap] > ready_time else ready_time
+                if candidate + duration <= ends[gap]:
+                    start_time = candidate
+                    break
+                gap += 1
+
+            if start_time >= 0:
+                # The operation splits the gap, we keep the parts before and after it if they are still usable
+                end_time: int = start_time + duration
+                keep_before: bool = start_time - starts[gap] >= min_gap
+                keep_after: bool = ends[gap] - end_time >= min_gap
+                if keep_before and keep_after:
+                    starts.insert(gap + 1, end_time)
+                    ends.insert(gap + 1, ends[gap])
+                    ends[gap] = start_time
+                elif keep_before:
+                    ends[gap] = start_time
+                elif keep_after:
+                    starts[gap] = end_time
+                else:
+                    del starts[gap]
+                    del ends[gap]
+            else:
+                # No gap is big enough, the operation goes after the last one of the machine, possibly leaving a new gap
+                start_time = machine_times[machine_id] if machine_times[machine_id] > ready_time else ready_time
+                if start_time - machine_times[machine_id] >= min_gap:
+                    starts.append(machine_times[machine_id])
+                    ends.append(start_time)
+                end_time = start_time + duration
+                machine_times[machine_id] = end_time
+
+            job_last_times[job_id] = end_time
+            scheduled_tasks[job_id] = operation_index + 1
+            if scheduled is not None:
+                scheduled.append((job_id, operation_index, machine_id, start_time, end_time))
+
+        return max(machine_times)
+
+
+DECODERS = ('semi_active', 'active')
+
+
+def create_decoder(instance: CompiledInstance, kind: str) -> Union[Decoder, ActiveDecoder]:
+    # kind is the global_configs.decoder setting
+    if kind == 'semi_active':
+        return Decoder(instance)
+    if kind == 'active':
+        return ActiveDecoder(instance)
+    raise ValueError(f"Unknown decoder: {kind}")
+
+
+# IncrementalEvaluator keeps a base solution and checkpoints of the machine/job ready times along its operation sequence,
+# so a neighbour that differs only from some position onwards is decoded starting from the closest checkpoint before that position
+class IncrementalEvaluator:
+    def __init__(self, instance: CompiledInstance, checkpoint_interval: int = 0):
+        self.instance: CompiledInstance = instance
+        # By default we keep around sqrt(number of operations) checkpoints, each one sqrt(number of operations) positions apart
+        self.checkpoint_interval: int = checkpoint_interval or max(1, int(math.sqrt(instance.num_operations)))
+        self.num_checkpoints: int = (instance.num_operations + self.checkpoint_interval - 1) // self.checkpoint_interval
+        # checkpoints[c] is the state (machine_times, job_last_times, scheduled_tasks) before the position c * checkpoint_interval of the base sequence
+        self.checkpoints: List[Tuple[List[int], List[int], List[int]]] = []
+        # operation_positions[global_operation] gives the position of that operation in the base sequence
+        self.operation_positions: List[int] = [0] * instance.num_operations
+        self.makespan: int = 0                      # The makespan of the base solution
+
+        # Checkpoints recorded by the last evaluation, they become the base ones if the neighbour is accepted
+        self._pending_checkpoints: List[Tuple[List[int], List[int], List[int]]] = []
+        self._pending_from: int = 0                 # Index of the first checkpoint recorded by the last evaluation
+        self._pending_makespan: int = 0
+
+    def set_base(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        # Fully decodes the solution, making it the base one, and returns its makespan
+        self._decode(operation_sequence, machine_assignment, 0)
+        self.accept(operation_sequence)
+        return self.makespan
+
+    def evaluate_from(self, operation_sequence: List[int], machine_assignment: List[List[int]], position: int) -> int:
+        # Returns the makespan of a solution that is identical to the base one before the given position
+        return self._decode(operation_sequence, machine_assignment, position // self.checkpoint_interval)
+
+    def evaluate_move(self, neighbor: Tuple[List[int], List[List[int]]], move) -> int:
+        # Returns the makespan of the neighbour obtained by applying the move to the base solution
+        position: int = move.first_position(self.operation_positions, self.instance.job_offsets)
+        return self.evaluate_from(neighbor[0], neighbor[1], position)
+
+    def accept(self, operation_sequence: List[int]) -> None:
+        # Makes the last evaluated solution the base one, the checkpoints before the changed position are still valid
+        first: int = self._pending_from
+        self.checkpoints[first:] = self._pending_checkpoints
+        self.makespan = self._pending_makespan
+
+        # We update the positions of the operations which are placed after the first changed checkpoint
+        job_offsets: List[int] = self.instance.job_offsets
+        operation_positions: List[int] = self.operation_positions
+        scheduled_tasks: List[int] = self.checkpoints[first][2].copy() if first < len(self.checkpoints) else []
+        for position in range(first * self.checkpoint_interval, len(operation_sequence)):
+            job_id: int = operation_sequence[position]
+            operation_positions[job_offsets[job_id] + scheduled_tasks[job_id]] = position
+            scheduled_tasks[job_id] += 1
+
+    def _decode(self, operation_sequence: List[int], machine_assignment: List[List[int]], first_checkpoint: int) -> int:
+        if first_checkpoint == 0 or not self.checkpoints:
+            first_checkpoint = 0
+            machine_times: List[int] = [0] * self.instance.num_machines
+            job_last_times: List[int] = [0] * self.instance.num_jobs
+            scheduled_tasks: List[int] = [0] * self.instance.num_jobs
+        else:
+            machine_times, job_last_times, scheduled_tasks = self.checkpoints[first_checkpoint]
+            machine_times = machine_times.copy()
+            job_last_times = job_last_times.copy()
+            scheduled_tasks = scheduled_tasks.copy()
+
+        job_offsets: List[int] = self.instance.job_offsets
+        durations: List[int] = self.instance.durations
+        num_machines: int = self.instance.num_machines
+        interval: int = self.checkpoint_interval
+        sequence_length: int = len(operation_sequence)
+        pending: List[Tuple[List[int], List[int], List[int]]] = []
+
+        for checkpoint in range(first_checkpoint, self.num_checkpoints):
+            # We save the state before the first position of the checkpoint
+            pending.append((machine_times.copy(), job_last_times.copy(), scheduled_tasks.copy()))
+            for position in range(checkpoint * interval, min(sequence_length, (checkpoint + 1) * interval)):
+                job_id: int = operation_sequence[position]
+                operation_index: int = scheduled_tasks[job_id]
+                global_operation: int = job_offsets[job_id] + operation_index
+                machine_id: int = machine_assignment[job_id][operation_index]
+                start_time: int = machine_times[machine_id]
+                if job_last_times[job_id] > start_time:
+                    start_time = job_last_times[job_id]
+                end_time: int = start_time + durations[global_operation * num_machines + machine_id]
+                machine_times[machine_id] = end_time
+                job_last_times[job_id] = end_time
+                scheduled_tasks[job_id] = operation_index + 1
+
+        self._pending_checkpoints = pending
+        self._pending_from = first_checkpoint
+        self._pending_makespan = max(machine_times)
+        return self._pending_makespan
+
+
+# FullEvaluator has the same interface as IncrementalEvaluator but decodes every solution from the start with the given decoder
+# The checkpoints only work for the semi-active decoding, so it's used instead of IncrementalEvaluator with the active decoder
+# If an EvaluationCache is given the makespans are looked up there before decoding
+class FullEvaluator:
+    def __init__(self, decoder: Union[Decoder, ActiveDecoder], cache = None):
+        self.decoder: Union[Decoder, ActiveDecoder] = decoder
+        self.cache = cache
+        self.makespan: int = 0                      # The makespan of the base solution
+        self._pending_makespan: int = 0
+
+    def set_base(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        self.makespan = self._makespan(operation_sequence, machine_assignment)
+        return self.makespan
+
+    def evaluate_from(self, operation_sequence: List[int], machine_assignment: List[List[int]], position: int) -> int:
+        self._pending_makespan = self._makespan(operation_sequence, machine_assignment)
+        return self._pending_makespan
+
+    def evaluate_move(self, neighbor: Tuple[List[int], List[List[int]]], move) -> int:
+        return self.evaluate_from(neighbor[0], neighbor[1], 0)
+
+    def accept(self, operation_sequence: List[int]) -> None:
+        self.makespan = self._pending_makespan
+
+    def _makespan(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        if self.cache is None:
+            return self.decoder.makespan(operation_sequence, machine_assignment)
+        key: bytes = self.cache.key(operation_sequence, machine_assignment)
+        makespan: Optional[int] = self.cache.get(key)
+        if makespan is None:
+            makespan = self.decoder.makespan(operation_sequence, machine_assignment)
+            self.cache.put(key, makespan)
+        return makespan
+
+
+# Thread safe version which allocates it's own buffers on every call, can be used with a shared CompiledInstance
+def evaluate_makespan(instance: CompiledInstance, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+    return Decoder(instance).makespan(operation_sequence, machine_assignment)
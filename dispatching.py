@@ -0,0 +1,64 @@
+# Dispatching rules engine, builds a solution by repeatedly picking the next operation of one of the unfinished jobs by a priority rule
+# The next operation of every unfinished job waits in a heap keyed by the rule, so every dispatch costs O(log jobs) instead of a scan of all the jobs
+# Every picked operation is appended to the schedule of its machine after the previous operation of the job, which is exactly
+# what the decoder does, so the returned solution decoded (or materialized) gives the dispatched schedule
+import heapq
+from typing import List, Tuple
+
+from instance import CompiledInstance
+
+DISPATCHING_RULES = ('SPT', 'LPT', 'MWR', 'LWR')
+
+
+def operation_priority(instance: CompiledInstance, rule: str, global_operation: int) -> Tuple[int, int]:
+    # Returns the heap key of the operation (smaller is dispatched first) and the machine it will be processed on
+    # SPT: shortest duration, LPT: longest duration, MWR: most work remaining of the job, LWR: least work remaining
+    # Except LPT (which takes the longest option) we pick the first machine with the smallest duration, as the scanning rules did
+    num_machines: int = instance.num_machines
+    durations: List[int] = instance.durations
+    eligible_machines: Tuple[int, ...] = instance.eligible_machines[global_operation]
+    machine_id: int = eligible_machines[0]
+    duration: int = durations[global_operation * num_machines + machine_id]
+    for candidate in eligible_machines:
+        candidate_duration: int = durations[global_operation * num_machines + candidate]
+        if (candidate_duration > duration) if rule == 'LPT' else (candidate_duration < duration):
+            machine_id = candidate
+            duration = candidate_duration
+
+    if rule == 'SPT':
+        return duration, machine_id
+    if rule == 'LPT':
+        return -duration, machine_id
+    if rule == 'MWR':
+        return -instance.work_remaining[global_operation], machine_id
+    return instance.work_remaining[global_operation], machine_id
+
+
+def dispatch(instance: CompiledInstance, rule: str) -> Tuple[List[int], List[List[int]]]:
+    # Returns the solution built by the rule, ties are broken by the smaller job id
+    if rule not in DISPATCHING_RULES:
+        raise ValueError(f"Unknown heuristic: {rule}")
+    job_offsets: List[int] = instance.job_offsets
+    operation_sequence: List[int] = []
+    machine_assignment: List[List[int]] = [[] for _ in range(instance.num_jobs)]
+
+    # Heap entries are (key, job_id, machine_id), one for every unfinished job (so the heap size is the number of remaining jobs)
+    ready: List[Tuple[int, int, int]] = []
+    for job_id in range(instance.num_jobs):
+        if job_offsets[job_id] < job_offsets[job_id + 1]:
+            key, machine_id = operation_priority(instance, rule, job_offsets[job_id])
+            ready.append((key, job_id, machine_id))
+    heapq.heapify(ready)
+
+    while ready:
+        key, job_id, machine_id = heapq.heappop(ready)
+        operation_sequence.append(job_id)
+        machine_assignment[job_id].append(machine_id)
+
+        # The next operation of the job becomes ready, if the job is not complete
+        next_operation: int = job_offsets[job_id] + len(machine_assignment[job_id])
+        if next_operation < job_offsets[job_id + 1]:
+            key, machine_id = operation_priority(instance, rule, next_operation)
+            heapq.heappush(ready, (key, job_id, machine_id))
+
+    return operation_sequence, machine_assignment
@@ -0,0 +1,68 @@
+# EvaluationCache remembers the makespans of the recently evaluated solutions, so the heuristics don't decode the same schedule twice
+# The solutions are stored by a compact hash of a canonical form: with the semi-active decoder the schedule only depends on the order
+# of the operations on every machine, so operation sequences which differ only in the order of operations of different machines share one entry
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import List, Optional
+
+from instance import CompiledInstance
+
+
+class EvaluationCache:
+    def __init__(self, instance: CompiledInstance, max_size: int, canonical: bool = True):
+        self.instance: CompiledInstance = instance
+        self.max_size: int = max_size           # Maximum number of remembered solutions, the least recently used one is dropped first
+        # True for the semi-active decoding, for other decoders the order of the whole operation sequence matters, so it's hashed as it is
+        self.canonical: bool = canonical
+        self.entries: OrderedDict = OrderedDict()   # Hash of the solution -> makespan, ordered from the least to the most recently used
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def key(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> bytes:
+        # Returns the hash of the solution, 16 bytes are plenty to avoid collisions
+        data: array = array('i')
+        if self.canonical:
+            # The global operations processed by every machine in their order, -1 separates the machines
+            # (the machine assignment is included, since it decides on which machine list an operation is)
+            job_offsets: List[int] = self.instance.job_offsets
+            machine_orders: List[List[int]] = [[] for _ in range(self.instance.num_machines)]
+            scheduled_tasks: List[int] = [0] * self.instance.num_jobs
+            for job_id in operation_sequence:
+                operation_index: int = scheduled_tasks[job_id]
+                scheduled_tasks[job_id] = operation_index + 1
+                machine_orders[machine_assignment[job_id][operation_index]].append(job_offsets[job_id] + operation_index)
+            for machine_order in machine_orders:
+                data.extend(machine_order)
+                data.append(-1)
+        else:
+            data.extend(operation_sequence)
+            for job_assignment in machine_assignment:
+                data.extend(job_assignment)
+        return blake2b(data.tobytes(), digest_size = 16).digest()
+
+    def get(self, key: bytes) -> Optional[int]:
+        # Returns the remembered makespan or None, and counts the hit or the miss
+        makespan: Optional[int] = self.entries.get(key)
+        if makespan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return makespan
+
+    def put(self, key: bytes, makespan: int) -> None:
+        self.entries[key] = makespan
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+
+    def clear(self) -> None:
+        # Forgets the solutions and resets the counters, called before independent runs
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,136 @@
+# Experiment runner, runs every (instance, algorithm, repetition) cell of the grid on a process pool and saves the results to a file
+# Every cell gets a seed derived from the master seed and the cell itself, so the same grid gives the same results in any order
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from configModels import ConfigSection
+from scheduler import Scheduler
+from traces import ConvergenceTrace, reset_trace
+
+# The fields saved for every run, in the order of the CSV columns
+RESULT_FIELDS: List[str] = ['instance', 'algorithm', 'repetition', 'seed', 'makespan', 'lower_bound', 'wall_time', 'evaluations', 'target',
+                            'time_to_target', 'stats']
+
+_worker_schedulers: Dict[str, Scheduler] = {}   # The schedulers of the current process, one per instance file
+
+
+def cell_seed(master_seed: int, instance_path: str, algorithm: str, repetition: int) -> int:
+    # Seeding with a string is deterministic, so the seed doesn't depend on the process or on the order of the cells
+    return random.Random(f'{master_seed}:{os.path.basename(instance_path)}:{algorithm}:{repetition}').getrandbits(64)
+
+
+def run_cell(instance_path: str, algorithm: str, repetition: int, seed: int, target: Optional[int] = None,
+             instrument: bool = False, trace_memory: bool = False, trace_path: Optional[str] = None,
+             params: Optional[ConfigSection] = None, evaluation_limit: Optional[int] = None) -> Dict:
+    # Runs one algorithm once on the instance and returns the result row
+    # If a target makespan is given we also save the time needed to reach it (None if it was never reached)
+    # With instrument the row also gets the statistics of the run (RunStats.as_dict()), otherwise stats is None
+    # With trace_path every new best makespan of the run is appended to that JSONL file as soon as it's found
+    # params are the parameters of the algorithm (config.json by default) and evaluation_limit it's evaluation budget
+    if instance_path not in _worker_schedulers:
+        _worker_schedulers[instance_path] = Scheduler.from_file(instance_path)
+    scheduler: Scheduler = _worker_schedulers[instance_path]
+    if instrument:
+        scheduler.enable_instrumentation(trace_memory)
+    else:
+        scheduler.disable_instrumentation()
+
+    random.seed(seed)
+    scheduler.evaluations = 0
+    if scheduler.cache is not None:
+        scheduler.cache.clear()     # The runs must be independent, so one can't reuse the makespans of the previous one
+    scheduler.monitor.start(target)
+    start: float = time.perf_counter()
+    if trace_path is not None:
+        with ConvergenceTrace(trace_path, os.path.basename(instance_path), algorithm, repetition, seed) as trace:
+            scheduler.run(algorithm, evaluation_limit = evaluation_limit, progress_callback = trace, params = params)
+            trace.end(scheduler.monitor.best_makespan, scheduler.monitor.elapsed(), scheduler.monitor.evaluations)
+    else:
+        scheduler.run(algorithm, evaluation_limit = evaluation_limit, params = params)
+    wall_time: float = time.perf_counter() - start
+    makespan: int = scheduler.get_makespan()
+    evaluations: int = scheduler.evaluations
+    scheduler.reset_scheduler()
+
+    return {
+        'instance': os.path.basename(instance_path),
+        'algorithm': algorithm,
+        'repetition': repetition,
+        'seed': seed,
+        'makespan': makespan,
+        'lower_bound': scheduler.lower_bound,
+        'wall_time': wall_time,
+        'evaluations': evaluations,
+        'target': target,
+        'time_to_target': scheduler.monitor.target_time,
+        'stats': scheduler.stats.as_dict() if instrument else None
+    }
+
+
+# targets optionally gives the target makespan of every instance path, used for the time to target
+# instrument and trace_memory enable the instrumentation of the runs, trace_path the convergence traces (see run_cell())
+def run_experiments(instance_paths: List[str], algorithms: List[str], repetitions: int, workers: int, master_seed: int,
+                    results_path: str, targets: Optional[Dict[str, int]] = None, instrument: bool = False,
+                    trace_memory: bool = False, trace_path: Optional[str] = None) -> List[Dict]:
+    targets = targets or {}
+    if trace_path is not None:
+        reset_trace(trace_path)
+    cells = [
+        (instance_path, algorithm, repetition, cell_seed(master_seed, instance_path, algorithm, repetition), targets.get(instance_path),
+         instrument, trace_memory, trace_path)
+        for instance_path in instance_paths for algorithm in algorithms for repetition in range(repetitions)
+    ]
+    print(f'Running {len(cells)} runs on {workers} worker(s)...')
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            futures = [pool.submit(run_cell, *cell) for cell in cells]
+            results: List[Dict] = [future.result() for future in futures]
+    else:
+        results = [run_cell(*cell) for cell in cells]
+
+    save_results(results, results_path)
+    print(f'Results saved to {results_path}')
+    return results
+
+
+def save_results(results: List[Dict], results_path: str) -> None:
+    # The format is picked by the extension, .json or .csv
+    directory: str = os.path.dirname(results_path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    if results_path.endswith('.json'):
+        with open(results_path, 'w') as file:
+            json.dump(results, file, indent = 2)
+    else:
+        with open(results_path, 'w', newline = '') as file:
+            writer = csv.DictWriter(file, fieldnames = RESULT_FIELDS)
+            writer.writeheader()
+            # The stats are nested, so in the CSV they are saved as a JSON string
+            writer.writerows(dict(row, stats = json.dumps(row['stats'])) if row.get('stats') else row for row in results)
+
+
+def load_results(results_path: str) -> List[Dict]:
+    if results_path.endswith('.json'):
+        with open(results_path, 'r') as file:
+            return json.load(file)
+
+    results: List[Dict] = []
+    with open(results_path, 'r', newline = '') as file:
+        for row in csv.DictReader(file):
+            row['repetition'] = int(row['repetition'])
+            row['seed'] = int(row['seed'])
+            row['makespan'] = int(row['makespan'])
+            row['lower_bound'] = int(row['lower_bound']) if row.get('lower_bound') else None      # Missing in the files written before the bounds
+            row['wall_time'] = float(row['wall_time'])
+            row['evaluations'] = int(row['evaluations'])
+            row['target'] = int(row['target']) if row.get('target') else None                            # Empty in the CSV when missing
+            row['time_to_target'] = float(row['time_to_target']) if row.get('time_to_target') else None
+            row['stats'] = json.loads(row['stats']) if row.get('stats') else None
+            results.append(row)
+    return results
@@ -0,0 +1,87 @@
+# CompiledInstance is a flat, read-only view of the problem, built once from the parsed jobs (or directly from the parsed arrays)
+from typing import List, Sequence, Tuple
+
+from models import Job
+
+
+class CompiledInstance:
+    def __init__(self, jobs: List[Job], num_machines: int):
+        # The tasks of all the operations one after another, in the same layout as the arrays of the instance loader
+        task_machines: List[int] = []
+        task_durations: List[int] = []
+        task_offsets: List[int] = [0]
+        job_offsets: List[int] = [0]
+        for job in jobs:
+            for task_list in job.operations:
+                task_machines += [task.machine_id for task in task_list]
+                task_durations += [task.duration for task in task_list]
+                task_offsets.append(len(task_machines))
+            job_offsets.append(len(task_offsets) - 1)
+        self._compile(num_machines, task_machines, task_durations, task_offsets, job_offsets)
+
+    @classmethod
+    def from_arrays(cls, num_machines: int, arrays: Tuple[Sequence[int], ...]) -> 'CompiledInstance':
+        # Builds the instance directly from the arrays of instance_loader.load_arrays(), without the Job objects
+        instance: CompiledInstance = cls.__new__(cls)
+        instance._compile(num_machines, *(array.tolist() if hasattr(array, 'tolist') else array for array in arrays))
+        return instance
+
+    def _compile(self, num_machines: int, task_machines: List[int], task_durations: List[int], task_offsets: List[int],
+                 job_offsets: List[int]) -> None:
+        self.num_jobs: int = len(job_offsets) - 1       # Number of jobs in the instance
+        self.num_machines: int = num_machines           # Number of machines in the instance
+
+        # job_offsets[job_id] gives the global index of the first operation of the job, the operations of job_id are
+        # job_offsets[job_id] ... job_offsets[job_id + 1] - 1 (ex: for jobs with 2, 3, 1 operations it will be [0, 2, 5, 6])
+        self.job_offsets: List[int] = list(job_offsets)
+        self.num_operations: int = self.job_offsets[-1]     # Total number of operations of all the jobs
+
+        # The job id for every global operation index
+        self.operation_job: List[int] = [
+            job_id for job_id in range(self.num_jobs) for _ in range(job_offsets[job_id], job_offsets[job_id + 1])
+        ]
+        # Duration table, durations[global_operation * num_machines + machine_id] gives the processing time
+        # of the operation on that machine, or -1 if the machine can't process it
+        self.durations: List[int] = [-1] * (self.num_operations * num_machines)
+        # The list of machines that can process each global operation, in the same order as in the task list
+        self.eligible_machines: List[Tuple[int, ...]] = []
+        # The minimal duration of each global operation
+        self.min_durations: List[int] = []
+
+        for global_operation in range(self.num_operations):
+            start, end = task_offsets[global_operation], task_offsets[global_operation + 1]
+            machines: Tuple[int, ...] = tuple(task_machines[start:end])
+            durations: List[int] = task_durations[start:end]
+            for machine_id, duration in zip(machines, durations):
+                self.durations[global_operation * num_machines + machine_id] = duration
+            self.eligible_machines.append(machines)
+            self.min_durations.append(min(durations))
+
+        # The minimal work left in the job starting from each global operation (the operation included)
+        self.work_remaining: List[int] = [0] * self.num_operations
+        for job_id in range(self.num_jobs):
+            remaining: int = 0
+            for global_operation in reversed(range(self.job_offsets[job_id], self.job_offsets[job_id + 1])):
+                remaining += self.min_durations[global_operation]
+                self.work_remaining[global_operation] = remaining
+
+        # The global operations which can be processed by more than one machine, the only ones a machine change can be applied to
+        self.flexible_operations: List[int] = [
+            global_operation for global_operation in range(self.num_operations) if len(self.eligible_machines[global_operation]) > 1
+        ]
+
+    def duration(self, job_id: int, operation_index: int, machine_id: int) -> int:
+        # Returns the duration of the operation_index-th operation of the job on the machine, -1 if not eligible
+        return self.durations[(self.job_offsets[job_id] + operation_index) * self.num_machines + machine_id]
+
+    def num_job_operations(self, job_id: int) -> int:
+        return self.job_offsets[job_id + 1] - self.job_offsets[job_id]
+
+    def sequence_operations(self, operation_sequence: List[int]) -> List[int]:
+        # Returns the global operation at every position of the operation sequence
+        scheduled_tasks: List[int] = [0] * self.num_jobs
+        operations: List[int] = []
+        for job_id in operation_sequence:
+            operations.append(self.job_offsets[job_id] + scheduled_tasks[job_id])
+            scheduled_tasks[job_id] += 1
+        return operations
@@ -0,0 +1,103 @@
+# Binary cache of the parsed instances, so the text of an instance file is only parsed the first time it's used
+# Next to every instance we keep <instance>.cache.npy with all it's arrays one after another and <instance>.cache.json with the
+# number of machines, the lengths of the arrays and the size, modification time and hash of the source file it was made from
+# The .npy file is opened memory mapped, so loading it doesn't read or copy the arrays, the pages are read when they're used
+# The cache needs NumPy, without it the instances are always parsed
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_VERSION: int = 1      # Increased when the layout of the cache changes, the older caches are then rebuilt
+
+
+def cache_paths(path: str) -> Tuple[str, str]:
+    # The array file and the metadata file of an instance
+    return f'{path}.cache.npy', f'{path}.cache.json'
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size = 16)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(path: str) -> Optional[Tuple[int, Tuple[Sequence[int], ...]]]:
+    # Returns the number of machines and the arrays saved by save_cache(), as read-only views of the memory mapped file,
+    # or None if there is no valid cache for the current content of the file
+    if np is None:
+        return None
+    array_path, meta_path = cache_paths(path)
+    try:
+        with open(meta_path, 'r') as file:
+            meta: Dict = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != CACHE_VERSION:
+        return None
+
+    source = os.stat(path)
+    if meta['size'] != source.st_size:
+        return None
+    if meta['mtime_ns'] != source.st_mtime_ns:
+        # The file was touched or copied, the cache is still valid if the content is the same, then we remember the new time
+        if meta['hash'] != file_hash(path):
+            return None
+        meta['mtime_ns'] = source.st_mtime_ns
+        _write_meta(meta_path, meta)
+
+    try:
+        data = np.load(array_path, mmap_mode = 'r')
+    except (OSError, ValueError):
+        return None
+    if len(data) != sum(meta['lengths']):     # Written by another version or cut off
+        return None
+    arrays = []
+    start: int = 0
+    for length in meta['lengths']:
+        arrays.append(data[start:start + length])
+        start += length
+    return meta['machines'], tuple(arrays)
+
+
+def save_cache(path: str, machinesNr: int, arrays: Tuple[Sequence[int], ...]) -> None:
+    # Writes the cache of the instance, it's only an optimisation so nothing happens if NumPy is missing or the directory is read-only
+    if np is None:
+        return
+    array_path, meta_path = cache_paths(path)
+    source = os.stat(path)
+    meta: Dict = {
+        'version': CACHE_VERSION,
+        'machines': machinesNr,
+        'lengths': [len(array) for array in arrays],
+        'size': source.st_size,
+        'mtime_ns': source.st_mtime_ns,
+        'hash': file_hash(path)
+    }
+    data = np.concatenate([np.asarray(array, dtype = np.int64) for array in arrays])
+    try:
+        # Written to a temporary file and renamed, so a process reading the cache at the same time never sees half of it
+        temporary_path: str = f'{array_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, data)
+        os.replace(temporary_path, array_path)
+        _write_meta(meta_path, meta)
+    except OSError:
+        pass
+
+
+def _write_meta(meta_path: str, meta: Dict) -> None:
+    temporary_path: str = f'{meta_path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, 'w') as file:
+            json.dump(meta, file)
+        os.replace(temporary_path, meta_path)
+    except OSError:
+        pass
@@ -0,0 +1,146 @@
+### Data Reading from the file and object creation ###
+# read_instance() reads both instance formats, it finds the format of the file by itself
+# The file is mapped in memory and all it's numbers are converted to integers at once, then the jobs are built in a single pass
+# over the numbers, which is much faster than splitting and converting the file line by line for the large instances
+# The parsed arrays are also saved in a binary cache next to the file (see instance_cache.py), later runs load them from there
+import mmap
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from config_loader import config
+from instance_cache import load_cache, save_cache
+from models import Job, Machine, Task
+
+# The SchedulingLab format (https://github.com/SchedulingLab/fjsp-instances), used by dataset_github.txt and the benchmarks:
+"""
+First line: <number of jobs> <number of machines>
+Then one line per job: <number of operations> and then, for each operation, <number of machines for this operation> and for each machine, a pair <machine> <processing time>.
+Machine index starts at 0.
+"""
+# The bracket format, used by dataset2.txt:
+"""
+First line: <number of jobs> <number of machines>
+Then one line per job: for each operation, the pairs <machine> <processing time> of the operation between brackets, ex: [0 2 1 11] [1 3]
+"""
+FORMATS = ('schedulinglab', 'bracket')
+
+# In the bracket format we replace the ']' and the line ends by these markers before the conversion, the real numbers are never negative
+_OPERATION_END: int = -1
+_JOB_END: int = -2
+
+
+def detect_format(data: bytes) -> str:
+    # Only the bracket format has brackets
+    return 'bracket' if data.find(b'[') != -1 else 'schedulinglab'
+
+
+# The parsed numbers of an instance as flat lists: the tasks of all the operations one after another (task_machines[i], task_durations[i]),
+# task_offsets[operation] ... task_offsets[operation + 1] - 1 are the tasks of an operation and job_offsets[job_id] ... job_offsets[job_id + 1] - 1
+# are the operations of a job
+# They are lists when the file is parsed and read-only NumPy arrays when they come from the binary cache
+InstanceArrays = Tuple[Sequence[int], Sequence[int], Sequence[int], Sequence[int]]
+
+
+def read_instance(path: str) -> Tuple[List[Job], List[Machine]]:
+    return build_jobs(*load_arrays(path))
+
+
+def load_arrays(path: str, use_cache: Optional[bool] = None) -> Tuple[int, InstanceArrays]:
+    # Returns the number of machines and the arrays of the instance, from the binary cache if it's valid, otherwise the file is parsed
+    # and the cache is written for the next time, use_cache defaults to global_configs.instance_cache
+    if use_cache is None:
+        use_cache = config.global_configs.instance_cache
+    if use_cache:
+        cached = load_cache(path)
+        if cached is not None:
+            return cached
+    machinesNr, arrays = parse_instance(path)
+    if use_cache:
+        save_cache(path, machinesNr, arrays)
+    return machinesNr, arrays
+
+
+def build_jobs(machinesNr: int, arrays: InstanceArrays) -> Tuple[List[Job], List[Machine]]:
+    # The Job, Task and Machine objects of the instance, the NumPy arrays are converted to lists at once first
+    task_machines, task_durations, task_offsets, job_offsets = (array.tolist() if hasattr(array, 'tolist') else array for array in arrays)
+
+    # All the tasks are created at once and every operation is a slice of them
+    tasks: List[Task] = list(map(Task, task_machines, task_durations))
+    operations: List[List[Task]] = [tasks[task_offsets[op]:task_offsets[op + 1]] for op in range(len(task_offsets) - 1)]
+    allJobs: List[Job] = [Job(job_id, operations[job_offsets[job_id]:job_offsets[job_id + 1]]) for job_id in range(len(job_offsets) - 1)]
+
+    # Define machines
+    machines: List[Machine] = [Machine(i) for i in range(machinesNr)]
+    return allJobs, machines
+
+
+def parse_instance(path: str) -> Tuple[int, InstanceArrays]:
+    # Returns the number of machines and the arrays of the instance
+    if os.path.getsize(path) == 0:  # An empty file can't be mapped, it has no jobs and no machines
+        return 0, ([], [], [0], [0])
+
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as data:
+        # The header is the first non empty line: <number of jobs> <number of machines>, some files also have the mean number of
+        # machines per operation after them, we don't need it
+        first_number = re.search(rb'\S', data)
+        if first_number is None:    # Only whitespace
+            return 0, ([], [], [0], [0])
+        header_end: int = data.find(b'\n', first_number.start())
+        if header_end == -1:
+            header_end = len(data)
+        machinesNr: int = int(data[first_number.start():header_end].split()[1])
+
+        if detect_format(data) == 'bracket':
+            return machinesNr, _parse_bracket(data[header_end:])
+        return machinesNr, _parse_schedulinglab(data[header_end:])
+
+
+def _parse_schedulinglab(body: bytes) -> InstanceArrays:
+    # Every job starts with it's number of operations and every operation with it's number of machines, so we don't need the lines
+    values: List[int] = list(map(int, body.split()))   # All the numbers of the jobs, converted at once
+    task_machines: List[int] = []
+    task_durations: List[int] = []
+    task_offsets: List[int] = [0]
+    job_offsets: List[int] = [0]
+    index: int = 0                                      # The index of where we are in the number array
+
+    while index < len(values):
+        num_ops: int = values[index]
+        index += 1
+        for op in range(num_ops):
+            end: int = index + 1 + 2 * values[index]    # The pairs <machine> <processing time> of the operation are values[index + 1 : end]
+            task_machines += values[index + 1:end:2]
+            task_durations += values[index + 2:end:2]
+            task_offsets.append(len(task_machines))
+            index = end
+        job_offsets.append(len(task_offsets) - 1)
+    return task_machines, task_durations, task_offsets, job_offsets
+
+
+def _parse_bracket(body: bytes) -> InstanceArrays:
+    # The operations have no count, so the ']' and the line ends become markers and the '[' are dropped before the conversion
+    body = body.replace(b'[', b' ').replace(b']', b' %d ' % _OPERATION_END).replace(b'\n', b' %d ' % _JOB_END)
+    values: List[int] = list(map(int, body.split()))
+    task_machines: List[int] = []
+    task_durations: List[int] = []
+    task_offsets: List[int] = [0]
+    job_offsets: List[int] = [0]
+    index: int = 0
+
+    while index < len(values):
+        value: int = values[index]
+        if value == _OPERATION_END:
+            task_offsets.append(len(task_machines))
+            index += 1
+        elif value == _JOB_END:
+            if len(task_offsets) - 1 > job_offsets[-1]:     # We skip the empty lines
+                job_offsets.append(len(task_offsets) - 1)
+            index += 1
+        else:
+            task_machines.append(value)
+            task_durations.append(values[index + 1])
+            index += 2
+    if len(task_offsets) - 1 > job_offsets[-1]:             # The last line may have no line end
+        job_offsets.append(len(task_offsets) - 1)
+    return task_machines, task_durations, task_offsets, job_offsets
@@ -0,0 +1,114 @@
+# Opt-in instrumentation of the Scheduler: counts the calls of the main methods, sums the time spent in them and can sample the peak memory
+# When it's enabled the methods of the scheduler object are replaced by timed wrappers, when it's disabled the wrappers are removed,
+# so a scheduler without instrumentation runs exactly the same code as before
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+# The Scheduler methods we time, the times are inclusive (evaluate_moves() also contains the time of the evaluate_move() calls it makes)
+INSTRUMENTED_METHODS = (
+    'evaluate', 'evaluate_many', 'set_current_solution', 'evaluate_move', 'evaluate_moves', 'make_move',
+    'random_move', 'critical_moves', 'generate_moves', 'generate_neighbor', 'crossover', 'tournament',
+    'materialize', 'reset_scheduler'
+)
+
+
+class RunStats:
+    # The statistics of one run of an algorithm
+    def __init__(self, algorithm: str):
+        self.algorithm: str = algorithm
+        self.calls: Dict[str, int] = {}         # Number of calls of every instrumented method
+        self.times: Dict[str, float] = {}       # Seconds spent in every instrumented method
+        self.counters: Dict[str, int] = {}      # Other counts: evaluations, accepted moves, cache hits and misses
+        self.wall_time: float = 0.0
+        self.peak_memory: Optional[int] = None  # Peak of the memory allocated during the run in bytes, only with trace_memory
+
+    def acceptance_rate(self) -> Optional[float]:
+        # Accepted moves over evaluated moves, for the local searches
+        evaluated: int = self.calls.get('evaluate_move', 0)
+        return self.counters.get('accepted_moves', 0) / evaluated if evaluated else None
+
+    def as_dict(self) -> Dict:
+        return {
+            'algorithm': self.algorithm,
+            'calls': self.calls,
+            'times': self.times,
+            'counters': self.counters,
+            'acceptance_rate': self.acceptance_rate(),
+            'wall_time': self.wall_time,
+            'peak_memory': self.peak_memory
+        }
+
+
+class Instrumentation:
+    def __init__(self, scheduler, trace_memory: bool = False):
+        self.scheduler = scheduler
+        self.trace_memory: bool = trace_memory     # tracemalloc makes the run several times slower, so it's a separate option
+        self.stats: Optional[RunStats] = None      # The stats of the current run, None between runs
+        self._start_time: float = 0.0
+        self._start_evaluations: int = 0
+        self._start_cache: tuple = (0, 0)
+        self._counting_accepts: bool = True        # False while a new base solution is set, that's not an accepted move
+
+    def attach(self) -> None:
+        for name in INSTRUMENTED_METHODS:
+            setattr(self.scheduler, name, self._timed(name, getattr(self.scheduler, name)))
+        # Every accepted move of the local searches goes through the accept() of the incremental evaluator
+        incremental = self.scheduler.incremental
+        accept: Callable = incremental.accept
+        set_base: Callable = incremental.set_base
+
+        def counted_accept(*arguments, **keyword_arguments):
+            if self.stats is not None and self._counting_accepts:
+                self.stats.counters['accepted_moves'] = self.stats.counters.get('accepted_moves', 0) + 1
+            return accept(*arguments, **keyword_arguments)
+
+        def uncounted_set_base(*arguments, **keyword_arguments):
+            self._counting_accepts = False
+            try:
+                return set_base(*arguments, **keyword_arguments)
+            finally:
+                self._counting_accepts = True
+        incremental.accept = counted_accept
+        incremental.set_base = uncounted_set_base
+
+    def detach(self) -> None:
+        # Removing the instance attributes makes the class methods visible again
+        for name in INSTRUMENTED_METHODS:
+            delattr(self.scheduler, name)
+        del self.scheduler.incremental.accept
+        del self.scheduler.incremental.set_base
+
+    def start(self, algorithm: str) -> None:
+        self.stats = RunStats(algorithm)
+        self._start_evaluations = self.scheduler.evaluations
+        cache = self.scheduler.cache
+        self._start_cache = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        if self.trace_memory:
+            tracemalloc.start()
+        self._start_time = time.perf_counter()
+
+    def finish(self) -> RunStats:
+        stats: RunStats = self.stats
+        stats.wall_time = time.perf_counter() - self._start_time
+        if self.trace_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        stats.counters['evaluations'] = self.scheduler.evaluations - self._start_evaluations
+        cache = self.scheduler.cache
+        if cache is not None:
+            stats.counters['cache_hits'] = cache.hits - self._start_cache[0]
+            stats.counters['cache_misses'] = cache.misses - self._start_cache[1]
+        self.stats = None
+        return stats
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        def timed(*arguments, **keyword_arguments):
+            started: float = time.perf_counter()
+            try:
+                return method(*arguments, **keyword_arguments)
+            finally:
+                if self.stats is not None:
+                    self.stats.calls[name] = self.stats.calls.get(name, 0) + 1
+                    self.stats.times[name] = self.stats.times.get(name, 0.0) + time.perf_counter() - started
+        return timed
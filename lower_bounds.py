@@ -0,0 +1,60 @@
+# Lower bounds of the makespan of an instance, no schedule can be shorter than any of them
+# If a heuristic finds a schedule with the makespan equal to the lower bound that schedule is optimal, so the search can stop
+import heapq
+import math
+from typing import Dict, List
+
+from instance import CompiledInstance
+
+MAX_MACHINE_SETS: int = 16      # Sets of several machines checked by machine_set_bound(), each one costs a pass over all the sets
+
+
+def job_path_bound(instance: CompiledInstance) -> int:
+    # The operations of a job are processed one after another, so the makespan is at least the longest job done with the fastest machines
+    return max((instance.work_remaining[instance.job_offsets[job_id]] for job_id in range(instance.num_jobs)
+                if instance.num_job_operations(job_id) > 0), default = 0)
+
+
+def machine_set_bound(instance: CompiledInstance) -> int:
+    # For a set of machines S, the operations which can only be processed by machines of S need at least the sum of their
+    # minimal durations of work from S, which takes at least that sum / |S| time. Checking every set of eligible machines against
+    # every other one is quadratic (there can be almost as many sets as operations on flexible instances), so we check the single
+    # machines (the work of the operations which can't be moved to another machine), the set of all machines (the total minimal
+    # work spread over all the machines) and the MAX_MACHINE_SETS sets with the most work per machine, which give the best bounds
+    # The minimal work of the operations grouped by their set of eligible machines, the sets are bit masks of the machines
+    set_work: Dict[int, int] = {}
+    for global_operation in range(instance.num_operations):
+        machines: int = 0
+        for machine_id in instance.eligible_machines[global_operation]:
+            machines |= 1 << machine_id
+        set_work[machines] = set_work.get(machines, 0) + instance.min_durations[global_operation]
+    if not set_work:
+        return 0
+
+    bound: int = math.ceil(sum(set_work.values()) / instance.num_machines)
+    for machines, work in set_work.items():
+        if machines & (machines - 1) == 0:      # A single machine, no other set is a part of it
+            bound = max(bound, work)
+
+    def machines_count(machines: int) -> int:
+        return bin(machines).count('1')
+
+    candidates: List[int] = heapq.nlargest(MAX_MACHINE_SETS, (machines for machines in set_work if machines & (machines - 1)),
+                                           key = lambda machines: set_work[machines] / machines_count(machines))
+    for candidate in candidates:
+        # The work of all the sets included in the candidate
+        work: int = sum(operations_work for machines, operations_work in set_work.items() if machines & ~candidate == 0)
+        bound = max(bound, math.ceil(work / machines_count(candidate)))
+    return bound
+
+
+def lower_bounds(instance: CompiledInstance) -> Dict[str, int]:
+    return {
+        'job_path': job_path_bound(instance),
+        'machine_set': machine_set_bound(instance)
+    }
+
+
+def lower_bound(instance: CompiledInstance) -> int:
+    # The best of the bounds
+    return max(lower_bounds(instance).values())
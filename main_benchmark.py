@@ -0,0 +1,8 @@
+from cli import main
+
+
+### Main Execution ###
+# The same as: python cli.py benchmark (the algorithms are read from compare_algorithms.txt, the rest from config.json)
+# The guard is needed because the worker processes of the experiment runner import this module
+if __name__ == '__main__':
+    main(['benchmark'])
@@ -0,0 +1,97 @@
+# SearchMonitor follows a run of a heuristic: it receives every evaluated makespan from the Scheduler and remembers
+# the best one and when it was found, so we can know the time needed to reach a target makespan
+# It also keeps the budget of the run (time, evaluations and evaluations without improvement), the heuristics ask should_stop()
+# in their loops and return the best solution they found when it's True. It's also True once the lower bound is reached,
+# since then the best solution is optimal
+import time
+from typing import Callable, Dict, Optional
+
+# Called with (makespan, seconds from start, evaluations from start) every time a better makespan is found
+ProgressCallback = Callable[[int, float, int], None]
+
+
+class SearchMonitor:
+    def __init__(self, lower_bound: int = 0):
+        self.lower_bound: int = lower_bound             # Lower bound of the makespan of the instance, it doesn't change between runs
+        self.start_time: float = time.perf_counter()
+        self.start_wall_time: float = time.time()       # The same moment as start_time, comparable between processes
+        self.best_makespan: Optional[int] = None        # Best makespan evaluated since start()
+        self.best_time: Optional[float] = None          # Seconds from start() until the best makespan was found
+        self.target: Optional[int] = None               # Makespan we want to reach, None if there is no target
+        self.target_time: Optional[float] = None        # Seconds from start() until the target was first reached
+        self.evaluations: int = 0                       # Evaluations since start()
+        self.improvement_evaluations: int = 0           # Value of evaluations when the best makespan was last improved
+
+        # The budget, None means no limit
+        self.deadline: Optional[float] = None           # time.time() when the run must stop, comparable between processes
+        self.evaluation_limit: Optional[int] = None     # Value of evaluations when the run must stop
+        self.stagnation_limit: Optional[int] = None     # Number of evaluations without improvement after which the run stops
+        self.progress_callback: Optional[ProgressCallback] = None
+
+    def start(self, target: Optional[int] = None) -> None:
+        # Called before a run, forgets everything about the previous one (the budget too)
+        self.start_time = time.perf_counter()
+        self.start_wall_time = time.time()
+        self.best_makespan = None
+        self.best_time = None
+        self.target = target
+        self.target_time = None
+        self.evaluations = 0
+        self.improvement_evaluations = 0
+        self.set_budget()
+
+    def set_budget(self, time_limit: Optional[float] = None, evaluation_limit: Optional[int] = None, stagnation_limit: Optional[int] = None,
+                   progress_callback: Optional[ProgressCallback] = None) -> None:
+        # The limits are counted from now, calling it without arguments removes the budget
+        self.deadline = time.time() + time_limit if time_limit is not None else None
+        self.evaluation_limit = self.evaluations + evaluation_limit if evaluation_limit is not None else None
+        self.stagnation_limit = stagnation_limit
+        self.improvement_evaluations = self.evaluations
+        self.progress_callback = progress_callback
+
+    def worker_budget(self, parts: int) -> Dict:
+        # The budget of one of parts independent searches run in worker processes (set_budget() arguments),
+        # they share the deadline and split the remaining evaluations
+        return {
+            'time_limit': self.deadline - time.time() if self.deadline is not None else None,
+            'evaluation_limit': max(0, self.evaluation_limit - self.evaluations) // parts if self.evaluation_limit is not None else None,
+            'stagnation_limit': self.stagnation_limit
+        }
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def record(self, makespan: int, evaluations: int = 1) -> None:
+        # Called with every evaluated makespan (or the best one of a group of evaluations, with the size of the group)
+        self.evaluations += evaluations
+        if self.best_makespan is None or makespan < self.best_makespan:
+            self.best_makespan = makespan
+            self.best_time = self.elapsed()
+            self.improvement_evaluations = self.evaluations
+            if self.target is not None and self.target_time is None and makespan <= self.target:
+                self.target_time = self.best_time
+            if self.progress_callback is not None:
+                self.progress_callback(makespan, self.best_time, self.evaluations)
+
+    def target_reached_at(self) -> Optional[float]:
+        # time.time() when the target was reached, None if it wasn't, the worker processes send it to the monitor of the run
+        return self.start_wall_time + self.target_time if self.target_time is not None else None
+
+    def record_target(self, reached_at: Optional[float]) -> None:
+        # Called with the target_reached_at() of a worker before it's results are recorded, so the time to target is when the worker
+        # reached it and not when the parent collected it's results. The earliest of the workers is kept
+        if reached_at is None:
+            return
+        seconds: float = max(0.0, reached_at - self.start_wall_time)
+        if self.target_time is None or seconds < self.target_time:
+            self.target_time = seconds
+
+    def should_stop(self) -> bool:
+        # True when the best makespan is optimal or any part of the budget ran out
+        if self.best_makespan is not None and self.best_makespan <= self.lower_bound:
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            return True
+        if self.evaluation_limit is not None and self.evaluations >= self.evaluation_limit:
+            return True
+        return self.stagnation_limit is not None and self.evaluations - self.improvement_evaluations >= self.stagnation_limit
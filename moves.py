@@ -0,0 +1,84 @@
+# Move classes describe how a neighbour solution is obtained from the current one
+# apply() changes the solution in place and undo() restores it, so the heuristics can try a move without copying the whole solution,
+# neighbor() returns a modified copy for the places where we need to keep both solutions (GA offspring, batch evaluation)
+# They also know from which position of the operation sequence the neighbour starts to differ, which is what the incremental evaluator needs
+from typing import List, Optional, Tuple
+
+
+def copy_solution(solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
+    # Same as copy.deepcopy() for a solution, but much faster since we know it only contains lists of ints
+    operation_sequence, machine_assignment = solution
+    return operation_sequence.copy(), [job_assignment.copy() for job_assignment in machine_assignment]
+
+
+class SwapMove:
+    # Swaps the job ids at two positions of the operation sequence
+    def __init__(self, first: int, second: int):
+        self.first: int = first
+        self.second: int = second
+
+    def apply(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        operation_sequence: List[int] = solution[0]
+        operation_sequence[self.first], operation_sequence[self.second] = operation_sequence[self.second], operation_sequence[self.first]
+
+    def undo(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        self.apply(solution)    # Swapping again restores the sequence
+
+    def neighbor(self, solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
+        # Returns a new solution with the move applied, the given solution is not modified
+        new_solution: Tuple[List[int], List[List[int]]] = copy_solution(solution)
+        self.apply(new_solution)
+        return new_solution
+
+    def first_position(self, operation_positions: List[int], job_offsets: List[int]) -> int:
+        # Nothing before the smaller of the two positions changes
+        return min(self.first, self.second)
+
+
+class ReassignMove:
+    # Moves one operation of a job to a different machine
+    def __init__(self, job_id: int, operation_index: int, machine_id: int):
+        self.job_id: int = job_id
+        self.operation_index: int = operation_index
+        self.machine_id: int = machine_id
+        self.previous_machine_id: Optional[int] = None      # Set by apply(), used by undo()
+
+    def apply(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        job_assignment: List[int] = solution[1][self.job_id]
+        self.previous_machine_id = job_assignment[self.operation_index]
+        job_assignment[self.operation_index] = self.machine_id
+
+    def undo(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        solution[1][self.job_id][self.operation_index] = self.previous_machine_id
+
+    def neighbor(self, solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
+        new_solution: Tuple[List[int], List[List[int]]] = copy_solution(solution)
+        self.apply(new_solution)
+        return new_solution
+
+    def first_position(self, operation_positions: List[int], job_offsets: List[int]) -> int:
+        # The schedule changes starting from where the operation is placed in the sequence
+        return operation_positions[job_offsets[self.job_id] + self.operation_index]
+
+
+class InsertMove:
+    # Takes the job id from the source position of the operation sequence and inserts it so that it ends up at the target position
+    def __init__(self, source: int, target: int):
+        self.source: int = source
+        self.target: int = target
+
+    def apply(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        operation_sequence: List[int] = solution[0]
+        operation_sequence.insert(self.target, operation_sequence.pop(self.source))
+
+    def undo(self, solution: Tuple[List[int], List[List[int]]]) -> None:
+        operation_sequence: List[int] = solution[0]
+        operation_sequence.insert(self.source, operation_sequence.pop(self.target))
+
+    def neighbor(self, solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
+        new_solution: Tuple[List[int], List[List[int]]] = copy_solution(solution)
+        self.apply(new_solution)
+        return new_solution
+
+    def first_position(self, operation_positions: List[int], job_offsets: List[int]) -> int:
+        return min(self.source, self.target)
@@ -0,0 +1,113 @@
+# Critical path neighbourhood, it only contains moves that can reduce the makespan
+# The makespan is the length of the critical path (a chain of operations where each one starts exactly when the previous one ends),
+# so only moving or reassigning the operations of the critical path can make it shorter. The critical path is split in
+# critical blocks, the maximal groups of consecutive critical operations on the same machine, and we only change the order
+# at the ends of the blocks (swaps of the first/last two operations and insertions before the first or after the last operation)
+from typing import List, Tuple, Union
+
+from instance import CompiledInstance
+from moves import InsertMove, ReassignMove, SwapMove
+
+
+class DecodedSchedule:
+    # The schedule of a solution with everything needed to follow the critical path, all the lists are indexed by global operation
+    def __init__(self, instance: CompiledInstance, operation_sequence: List[int], machine_assignment: List[List[int]]):
+        num_operations: int = instance.num_operations
+        self.starts: List[int] = [0] * num_operations
+        self.ends: List[int] = [0] * num_operations
+        self.machines: List[int] = [0] * num_operations
+        self.positions: List[int] = [0] * num_operations               # Position of the operation in the operation sequence
+        self.machine_predecessors: List[int] = [-1] * num_operations    # The operation processed before on the same machine, -1 if none
+
+        job_offsets: List[int] = instance.job_offsets
+        durations: List[int] = instance.durations
+        num_machines: int = instance.num_machines
+        machine_times: List[int] = [0] * num_machines
+        machine_last: List[int] = [-1] * num_machines
+        job_last_times: List[int] = [0] * instance.num_jobs
+        scheduled_tasks: List[int] = [0] * instance.num_jobs
+
+        for position, job_id in enumerate(operation_sequence):
+            operation_index: int = scheduled_tasks[job_id]
+            global_operation: int = job_offsets[job_id] + operation_index
+            machine_id: int = machine_assignment[job_id][operation_index]
+            start_time: int = max(machine_times[machine_id], job_last_times[job_id])
+            end_time: int = start_time + durations[global_operation * num_machines + machine_id]
+            self.starts[global_operation] = start_time
+            self.ends[global_operation] = end_time
+            self.machines[global_operation] = machine_id
+            self.positions[global_operation] = position
+            self.machine_predecessors[global_operation] = machine_last[machine_id]
+            machine_times[machine_id] = end_time
+            machine_last[machine_id] = global_operation
+            job_last_times[job_id] = end_time
+            scheduled_tasks[job_id] = operation_index + 1
+
+        self.makespan: int = max(machine_times)
+
+    def critical_path(self) -> List[int]:
+        # Walks back from the operation that ends last, always to a predecessor that ends exactly when the current operation starts
+        # We prefer the machine predecessor, so the critical blocks are as long as possible
+        global_operation: int = self.ends.index(self.makespan)
+        path: List[int] = [global_operation]
+        while self.starts[global_operation] > 0:
+            machine_predecessor: int = self.machine_predecessors[global_operation]
+            if machine_predecessor != -1 and self.ends[machine_predecessor] == self.starts[global_operation]:
+                global_operation = machine_predecessor
+            else:
+                global_operation -= 1   # The previous operation of the same job
+            path.append(global_operation)
+        path.reverse()
+        return path
+
+    def critical_blocks(self) -> List[List[int]]:
+        # Splits the critical path in the groups of consecutive operations processed on the same machine
+        blocks: List[List[int]] = []
+        for global_operation in self.critical_path():
+            if blocks and self.machines[blocks[-1][-1]] == self.machines[global_operation]:
+                blocks[-1].append(global_operation)
+            else:
+                blocks.append([global_operation])
+        return blocks
+
+
+def critical_path_moves(instance: CompiledInstance, solution: Tuple[List[int], List[List[int]]]
+                        ) -> List[Union[SwapMove, InsertMove, ReassignMove]]:
+    operation_sequence, machine_assignment = solution
+    schedule: DecodedSchedule = DecodedSchedule(instance, operation_sequence, machine_assignment)
+    positions: List[int] = schedule.positions
+    operation_job: List[int] = instance.operation_job
+    job_offsets: List[int] = instance.job_offsets
+
+    # The sequence position of the previous/next operation of the same job, they limit where an operation can be moved to
+    def predecessor_position(global_operation: int) -> int:
+        return positions[global_operation - 1] if global_operation > job_offsets[operation_job[global_operation]] else -1
+
+    def successor_position(global_operation: int) -> int:
+        return positions[global_operation + 1] if global_operation + 1 < job_offsets[operation_job[global_operation] + 1] else len(operation_sequence)
+
+    moves: List[Union[SwapMove, InsertMove, ReassignMove]] = []
+    for block in schedule.critical_blocks():
+        if len(block) > 1:
+            first, last = block[0], block[-1]
+            # Swap the first two and the last two operations of the block, only if the jobs allow the two operations to change places
+            pairs: List[Tuple[int, int]] = [(block[0], block[1])] + ([(block[-2], block[-1])] if len(block) > 2 else [])
+            for u, v in pairs:
+                if predecessor_position(v) < positions[u] and successor_position(u) > positions[v]:
+                    moves.append(SwapMove(positions[u], positions[v]))
+            # Move an operation of the block before the first one or after the last one (the neighbours already covered by the swaps are skipped)
+            for operation in block[2:]:
+                if predecessor_position(operation) < positions[first]:
+                    moves.append(InsertMove(positions[operation], positions[first]))
+            for operation in block[:-2]:
+                if successor_position(operation) > positions[last]:
+                    moves.append(InsertMove(positions[operation], positions[last]))
+
+        # Process a critical operation on another machine
+        for global_operation in block:
+            job_id: int = operation_job[global_operation]
+            for machine_id in instance.eligible_machines[global_operation]:
+                if machine_id != schedule.machines[global_operation]:
+                    moves.append(ReassignMove(job_id, global_operation - job_offsets[job_id], machine_id))
+
+    return moves
@@ -0,0 +1,74 @@
+# Helpers for running independent parts of the heuristics on a pool of worker processes
+# Every worker builds it's own Scheduler once, when the pool starts: from the instance file (and it's binary cache) if the scheduler
+# was read from a file, otherwise from the jobs and machines sent by the pool initializer, so the instance is never sent with every task
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from configModels import GlobalConfigs
+from models import Job, Machine
+from scheduler import Scheduler
+
+_worker_scheduler: Optional[Scheduler] = None   # The Scheduler of the current worker process
+
+
+# The workers get the settings of the scheduler too, they may not be the ones of config.json
+def _init_worker(jobs: List[Job], machines: List[Machine], settings: GlobalConfigs) -> None:
+    global _worker_scheduler
+    _worker_scheduler = Scheduler(jobs, machines, copy_jobs = False, settings = settings)  # The unpickled jobs belong to the worker
+
+
+def _init_worker_from_file(path: str, settings: GlobalConfigs) -> None:
+    global _worker_scheduler
+    _worker_scheduler = Scheduler.from_file(path, settings)
+
+
+# Runs a Scheduler method in the worker with it's own seed, used with pool.submit()
+# budget gives the SearchMonitor.set_budget() arguments of the worker (see SearchMonitor.worker_budget()), None for no budget
+# target is the target makespan of the run, so the worker knows when it reaches it
+# Returns the result of the method, the number of evaluations it did and the time.time() when it reached the target (None if it didn't),
+# the parent gives the last one to SearchMonitor.record_target()
+def run_method(method_name: str, seed: int, arguments: Dict, budget: Optional[Dict] = None,
+               target: Optional[int] = None) -> Tuple[Any, int, Optional[float]]:
+    random.seed(seed)
+    _worker_scheduler.evaluations = 0
+    _worker_scheduler.monitor.start(target)
+    if budget is not None:
+        _worker_scheduler.monitor.set_budget(**budget)
+    result = getattr(_worker_scheduler, method_name)(**arguments)
+    return result, _worker_scheduler.evaluations, _worker_scheduler.monitor.target_reached_at()
+
+
+# Creates the process pool, every worker opens the instance file of the scheduler or gets it's jobs and machines once
+def create_pool(scheduler: Scheduler, workers: int) -> ProcessPoolExecutor:
+    if scheduler.source_path is not None:
+        return ProcessPoolExecutor(max_workers = workers, initializer = _init_worker_from_file,
+                                   initargs = (scheduler.source_path, scheduler.settings))
+    return ProcessPoolExecutor(max_workers = workers, initializer = _init_worker,
+                               initargs = (scheduler.jobs, scheduler.machines, scheduler.settings))
+
+
+# Derives the seeds of the workers from the master seed, the same master seed always gives the same seeds
+def derive_seeds(master_seed: Optional[int], count: int) -> List[int]:
+    if master_seed is None:
+        master_seed = random.getrandbits(64)    # Taken from the global generator, so random.seed() still makes the run reproducible
+    generator: random.Random = random.Random(master_seed)
+    return [generator.getrandbits(64) for _ in range(count)]
+
+
+# Runs the restarts of the heuristic (the name of a Scheduler method returning (solution, makespan)) on a process pool
+# and returns the list of (solution, makespan) results in the order of the restarts
+def run_parallel_restarts(scheduler: Scheduler, method_name: str, restarts: int, workers: int, master_seed: Optional[int],
+                          arguments: Dict) -> List[Tuple[Tuple[List[int], List[List[int]]], int]]:
+    seeds: List[int] = derive_seeds(master_seed, restarts)
+    budget: Dict = scheduler.monitor.worker_budget(restarts)    # Every restart gets it's part of the budget of the run
+    with create_pool(scheduler, min(workers, restarts)) as pool:
+        futures = [pool.submit(run_method, method_name, seed, arguments, budget, scheduler.monitor.target) for seed in seeds]
+        results: List[Tuple[Tuple[List[int], List[List[int]]], int]] = []
+        for future in futures:
+            result, evaluations, target_reached_at = future.result()
+            scheduler.evaluations += evaluations    # We count the evaluations done by the workers too
+            scheduler.monitor.record_target(target_reached_at)
+            scheduler.monitor.record(result[1], evaluations)     # The result is (solution, makespan)
+            results.append(result)
+        return results
@@ -2,17 +2,55 @@
 import copy
 import math
 import random
-from collections import deque
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple, Union
 
 from models import Job, Machine, Task
+from annealing import calibrate_temperature, cooling_rate
 from config_loader import config
+from configModels import (ConfigSection, GeneticAlgorithmConfig, GlobalConfigs, HillClimbingConfig, IteratedLocalSearch,
+                          SimulatedAnnealingConfig, TabuSearchConfig)
+try:
+    from batch_decoder import BatchDecoder     # Needs NumPy, without it we always evaluate the solutions one by one
+except ImportError:
+    BatchDecoder = None
+from decoder import ActiveDecoder, Decoder, FullEvaluator, IncrementalEvaluator, create_decoder
+from dispatching import dispatch
+from evaluation_cache import EvaluationCache
+from instance import CompiledInstance
+from instance_loader import build_jobs, load_arrays
+from instrumentation import Instrumentation, RunStats
+from lower_bounds import lower_bound
+from monitor import ProgressCallback, SearchMonitor
+from moves import InsertMove, ReassignMove, SwapMove, copy_solution
+from neighborhoods import critical_path_moves
+from tabu import TabuMemory, move_attributes
+
+
+# The section of config.json with the parameters of every heuristic, the dispatching rules have none
+HEURISTIC_SECTIONS: Dict[str, str] = {
+    'SA': 'simulated_annealing',
+    'HC': 'hill_climbing',
+    'TS': 'tabu_search',
+    'GA': 'genetic_algorithm',
+    'ILS': 'iterated_local_search'
+}
+
+
+def default_params(heuristic: str) -> ConfigSection:
+    # The parameters of the heuristic in config.json
+    return getattr(config, HEURISTIC_SECTIONS[heuristic])
 
 
 class Scheduler:
-    def __init__(self, jobs: List[Job], machines: List[Machine]):
-        self.jobs: List[Job] = copy.deepcopy(jobs)            # List of Job objects
-        self.machines: List[Machine] = copy.deepcopy(machines)    # List of Machine objects
+    # copy_jobs can be False when nobody else uses the jobs and machines (ex: they were just read from the file), copying the Task
+    # objects of a large instance takes much longer than reading it. instance is the compiled instance if the caller already has it
+    # settings are the global settings of this scheduler (decoder, cache, workers, budget...), global_configs of config.json by default
+    def __init__(self, jobs: List[Job], machines: List[Machine], copy_jobs: bool = True, instance: Optional[CompiledInstance] = None,
+                 source_path: Optional[str] = None, settings: Optional[GlobalConfigs] = None):
+        self.settings: GlobalConfigs = settings if settings is not None else config.global_configs
+        self.jobs: List[Job] = copy.deepcopy(jobs) if copy_jobs else jobs            # List of Job objects
+        self.machines: List[Machine] = copy.deepcopy(machines) if copy_jobs else machines    # List of Machine objects
+        self.source_path: Optional[str] = source_path   # The instance file, the worker processes read it instead of receiving the jobs
         self.global_max: int = 0
         self.work_remaining: Dict[int, List[int]] = {}      #will have the job id as a key and an array which will repesent the work remaining for each position
                                                             #ex: for [2 1 2 3 2 1] [0 3] [1 5] [1 6 1 3] will be [13 ,11 ,8, 4, 3, 0] (we take the min from task list) 
@@ -33,85 +71,43 @@ class Scheduler:
             #we reverse the pref array
             self.work_remaining[job.job_id].reverse()
 
+        # The flat read-only view of the problem used to evaluate the solutions
+        self.instance: CompiledInstance = instance if instance is not None else CompiledInstance(self.jobs, len(self.machines))
+        # Used by the heuristics to evaluate solutions without touching the jobs and machines, semi-active (the default) or active schedules
+        self.decoder: Union[Decoder, ActiveDecoder] = create_decoder(self.instance, self.settings.decoder)
+        semi_active: bool = isinstance(self.decoder, Decoder)
+        # Makespans of the recently evaluated solutions, None if global_configs.cache_size is 0
+        self.cache: Optional[EvaluationCache] = (
+            EvaluationCache(self.instance, self.settings.cache_size, canonical = semi_active) if self.settings.cache_size > 0 else None
+        )
+        # The incremental and batch evaluations only know the semi-active decoding, with the active decoder every solution is fully decoded
+        # (and cached, while the moves evaluated from a checkpoint are not since their partial decoding is cheaper than hashing the whole solution)
+        # Used by the local searches to evaluate a move only from the first changed position
+        self.incremental: Union[IncrementalEvaluator, FullEvaluator] = (
+            IncrementalEvaluator(self.instance) if semi_active else FullEvaluator(self.decoder, self.cache)
+        )
+        # Used to evaluate large groups of solutions at once
+        self.batch_decoder = BatchDecoder(self.instance) if BatchDecoder is not None and semi_active else None
+        self.evaluations: int = 0       # Number of evaluated solutions, it's never reset by the scheduler so the caller can measure a run
+        self.lower_bound: int = lower_bound(self.instance)     # No schedule is shorter, the heuristics stop when they reach it
+        self.monitor: SearchMonitor = SearchMonitor(self.lower_bound)   # Receives every evaluated makespan, the caller starts it before a run
+        self.instrumentation: Optional[Instrumentation] = None  # Set by enable_instrumentation()
+        self.stats: Optional[RunStats] = None                   # The statistics of the last run, only with the instrumentation enabled
+        # operation_tasks[global_operation][machine_id] gives the Task object, so we can write the times without searching the task list
+        self.operation_tasks: List[Dict[int, Task]] = [
+            {task.machine_id: task for task in task_list} for job in self.jobs for task_list in job.operations
+        ]
+
+
+    @classmethod
+    def from_file(cls, path: str, settings: Optional[GlobalConfigs] = None) -> 'Scheduler':
+        # Reads the instance file (from it's binary cache when it's valid), the jobs and the compiled instance are built from the same arrays
+        settings = settings if settings is not None else config.global_configs
+        machinesNr, arrays = load_arrays(path, settings.instance_cache)
+        jobs, machines = build_jobs(machinesNr, arrays)
+        return cls(jobs, machines, copy_jobs = False, instance = CompiledInstance.from_arrays(machinesNr, arrays), source_path = path,
+                   settings = settings)
 
-    def shortest_processing_time(self) -> Optional[Tuple[Job, Task]]:
-        next_task_touple: Optional[Tuple[Job, Task]] = None       
-        for job in self.jobs:                           # We go throught jobs                 
-            if (not job.is_complete()):                 # Check if it's completed (still has tasks)
-                curr_task_list: Optional[List[Task]] = job.get_next_task_list()    # Get it's next task list 
-                if (curr_task_list is not None):        # Check if it's not empty
-                    if(next_task_touple == None):              
-                        next_task_touple = (job, curr_task_list[0]) #format: (job, task)
-                    for task in curr_task_list:         # Check the tasks from the current
-                        if(task.duration < next_task_touple[1].duration):
-                            next_task_touple = (job, task)
-        
-        return next_task_touple    # format: (job, task)
-    
-    def longest_processing_time(self) -> Optional[Tuple[Job, Task]]:
-        next_task_touple = None       
-        for job in self.jobs:                           # We go throught jobs                 
-            if (not job.is_complete()):                 # Check if it's completed (still has tasks)
-                curr_task_list: Optional[List[Task]] = job.get_next_task_list()    # Get it's next task list 
-                if (curr_task_list is not None):        # Check if it's not empty
-                    if(next_task_touple == None):              
-                        next_task_touple = (job, curr_task_list[0]) #format: (job, task)
-                    for task in curr_task_list:         # Check the tasks from the current
-                        if(task.duration > next_task_touple[1].duration):
-                            next_task_touple = (job, task)
-        
-        return next_task_touple    # format: (job, task)
-    
-    # Most work remaining with picking to execute the task on the machine with least execution time
-    def most_work_remaining(self) -> Optional[Tuple[Job, Task]]:
-        next_task_touple = None             # Will hold the best (job, task) pair
-        next_task_list = None               # Will keep the task list from where we're gonna pick the task
-        next_task = None                    # Will keep the next task that will be returned
-        next_job = None                     # Will keep the job that will be returned
-        mx = None                           # Tracks the current maximum remaining work
-        for job in self.jobs:
-            if(not job.is_complete()):
-                work_remaining: int = self.work_remaining[job.job_id][job.current_operation_index]   # keeps the remaining work
-                if(mx == None or work_remaining > mx):                                          # if mx is not initialized or we find a new max then we update
-                    mx = self.work_remaining[job.job_id][job.current_operation_index]
-                    next_task_list = job.get_next_task_list()
-                    next_job = job
-
-        # Here we pick the task with min duration from the task list
-        next_task: Task = next_task_list[0]             # initialize the task with first task in the task list
-        for task in next_task_list:
-            if(task.duration < next_task.duration):
-                next_task = task
-        # Here we create the return tuple
-        next_task_touple = (next_job, next_task)
-
-        return next_task_touple
-    
-    # Least work remaining with picking to execute the task on the machine with least execution time
-    def least_work_remaining(self):
-        next_task_touple = None             # Will hold the best (job, task) pair
-        next_task_list = None               # Will keep the task list from where we're gonna pick the task
-        next_task = None                    # Will keep the next task that will be returned
-        next_job = None                     # Will keep the job that will be returned
-        mn = None                           # Tracks the current minimum remaining work
-        for job in self.jobs:
-            if(not job.is_complete()):
-                work_remaining: int = self.work_remaining[job.job_id][job.current_operation_index]   # keeps the remaining work
-                if(mn == None or work_remaining < mn):                                          # if mx is not initialized or we find a new min then we update
-                    mn = self.work_remaining[job.job_id][job.current_operation_index]
-                    next_task_list = job.get_next_task_list()
-                    next_job = job
-
-        # Here we pick the task with min duration from the task list
-        next_task: Task = next_task_list[0]             # initialize the task with first task in the task list
-        for task in next_task_list:
-            if(task.duration < next_task.duration):
-                next_task = task
-        # Here we create the return tuple
-        next_task_touple = (next_job, next_task)
-
-        return next_task_touple
-    
 
     # Will generate a starting solution for heuristics
     def generate_initial_solution(self) -> Tuple[List[int], List[List[int]]]:
@@ -124,317 +120,649 @@ class Scheduler:
 
         machine_assignment: List[List[int]] = []    # A 2D list where machine_assignment[job_id][operation_index] gives the machine ID for that operation.
                                                     # ex: [[0, 2], [1, 1, 0], [3]] Job 0: Operation 0 on Machine 0, Operation 1 on Machine 2 ...
-        for job in self.jobs:
-            job_assignment: List[int] = []          # Will create a list with the random picked machine id from the task list for every task and append it to the list
-            for task_list in job.operations:             # We iterate through the task lists
-                chosen_machine = random.choice(task_list)           # We pick a random possible task(we can call it subtask) with it's macihine that can solve our main task
-                job_assignment.append(chosen_machine.machine_id)    # Append it's machine id in our list of machine id's for the job
+        job_offsets: List[int] = self.instance.job_offsets
+        for job_id in range(self.instance.num_jobs):
+            job_assignment: List[int] = []          # Will create a list with the random picked machine id from the eligible machines for every task and append it to the list
+            for global_operation in range(job_offsets[job_id], job_offsets[job_id + 1]):     # We iterate through the operations of the job
+                chosen_machine: int = random.choice(self.instance.eligible_machines[global_operation])  # We pick a random machine that can solve our main task
+                job_assignment.append(chosen_machine)               # Append it in our list of machine id's for the job
             machine_assignment.append(job_assignment)               # Append the machine id's for task to our machine assignment list for every job
 
         return operation_sequence, machine_assignment               # Return both of them, the solution and associated machines
     
     # Will generate a starting solution based on a dispatching rule
     def generate_dispaching_inititial_solution(self, rule: str) -> Tuple[List[int], List[List[int]]]:
-        operation_sequence: List[int] = []  # # Will keep the order of the operations for the jobs
-        
-        machine_assignment: List[List[int]] = []    # A 2D list where machine_assignment[job_id][operation_index] gives the machine ID for that operation.
-                                                    # ex: [[0, 2], [1, 1, 0], [3]] Job 0: Operation 0 on Machine 0, Operation 1 on Machine 2 ...
-        
-        # We make sure to fulfil the list with the needed job size
-        for i in range(len(self.jobs)):
-            machine_assignment.append([])
-
-        # Here is the code we use in the run() method, we just remember the operations and machines
-        while any(not job.is_complete() for job in self.jobs): # do until all the jobs are completed
-            # Get all available tasks sorted by the chosen heuristic
-            if(rule == 'SPT'):
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.shortest_processing_time()   # format: (job, task)
-            elif rule == 'LPT':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.longest_processing_time()    # format: (job, task)
-            elif rule == 'MWR':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.most_work_remaining()        # format: (job, task)
-            elif rule == 'LWR':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.least_work_remaining()       # format: (job, task)
-            else:
-                raise ValueError(f"Unknown heuristic: {rule}")
-            
-            if next_task_tuple:
-                job, task = next_task_tuple
-
-                # Here we add the data from the dispatching rule in the needed format
-                operation_sequence.append(job.job_id)
-                machine_assignment[job.job_id].append(task.machine_id)
-
-                machine: Machine = self.machines[task.machine_id]
-                # Schedule the task at the earliest possible time for this machine
-                start = machine.schedule[-1][2] if machine.schedule else 0  # Get the end time of the last machine's task or make it 0
-
-                # Now we pick the max between the possible start time of the machine computed above and the possible start time of the job (the possible
-                #   start time of the job is more or equal to when it's previous operation ended) because we need to satisfy both conditions
-                start = max(start, job.last_ending_time)
-
-                end = start + task.duration                                 # Calculate the end time
-                machine.add_to_schedule(job.job_id, start, end)             # Add the task to needed machine's schedule
-                task.start_time = start                                     # Update Task's start time
-                task.end_time = end                                         # Update Task's end time
-                self.global_max = max(self.global_max, end)                 # Update global makespan if needed
-                job.last_ending_time = task.end_time                        # Update the job's last ending time
-                job.complete_operation()                                    # Mark the task as done
-
-        # Here we reset the scheduler and return the result
-        self.reset_scheduler()
-        return operation_sequence, machine_assignment
-        
+        # The dispatching engine keeps the ready operations in a heap, so this is cheap even for many jobs
+        return dispatch(self.instance, rule)
+
+    # Will compute only the makespan for the encoded operations array and machine assignments, the scheduler is not modified
+    # This is what the heuristics use to evaluate the solutions, call materialize() to apply a solution
+    # Not thread safe: the decoder, the incremental evaluator and the cache reuse their buffers and entries between calls, so a scheduler
+    # is used by one thread at a time (the parallel runs have one scheduler per process). Threads sharing the instance can call
+    # decoder.evaluate_makespan(scheduler.instance, ...) instead, which allocates it's own buffers and counts nothing
+    def evaluate(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        self.evaluations += 1
+        if self.cache is None:
+            makespan: int = self.decoder.makespan(operation_sequence, machine_assignment)
+        else:
+            key: bytes = self.cache.key(operation_sequence, machine_assignment)
+            makespan = self.cache.get(key)
+            if makespan is None:
+                makespan = self.decoder.makespan(operation_sequence, machine_assignment)
+                self.cache.put(key, makespan)
+        self.monitor.record(makespan)
+        return makespan
 
-    # Will compute the makespan for the encoded operations array and machine assignments and it also updates the scheduler with the computed solution
-    def compute_makespan(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
-        # Calculates the total completion time (makespan) for a given solution
+    # Will compute the makespans of a list of solutions, big enough lists are evaluated together by the NumPy batch decoder
+    def evaluate_many(self, solutions: List[Tuple[List[int], List[List[int]]]]) -> List[int]:
+        self.evaluations += len(solutions)
+        if self.cache is None:
+            makespans: List[int] = self.decode_many(solutions)
+        else:
+            # Only the solutions which are not in the cache are decoded
+            keys: List[bytes] = [self.cache.key(*solution) for solution in solutions]
+            makespans = [self.cache.get(key) for key in keys]
+            missing: List[int] = [index for index, makespan in enumerate(makespans) if makespan is None]
+            for index, makespan in zip(missing, self.decode_many([solutions[index] for index in missing])):
+                makespans[index] = makespan
+                self.cache.put(keys[index], makespan)
+        if makespans:
+            self.monitor.record(min(makespans), len(makespans))
+        return makespans
+
+    # Decodes the solutions without counting or caching them
+    def decode_many(self, solutions: List[Tuple[List[int], List[List[int]]]]) -> List[int]:
+        if self.batch_decoder is not None and len(solutions) >= self.settings.batch_threshold:
+            return self.batch_decoder.evaluate(solutions)
+        return [self.decoder.makespan(*solution) for solution in solutions]
+
+    # Will evaluate the solution and make it the base of the incremental evaluation, the moves are then evaluated with evaluate_move()
+    def set_current_solution(self, solution: Tuple[List[int], List[List[int]]]) -> int:
+        self.evaluations += 1
+        makespan: int = self.incremental.set_base(*solution)
+        self.monitor.record(makespan)
+        return makespan
+
+    # Will compute the makespan of the neighbour obtained by applying the move to the current solution, only from the first changed position
+    def evaluate_move(self, neighbor: Tuple[List[int], List[List[int]]], move: Union[SwapMove, InsertMove, ReassignMove]) -> int:
+        self.evaluations += 1
+        makespan: int = self.incremental.evaluate_move(neighbor, move)
+        self.monitor.record(makespan)
+        return makespan
+
+    # Will compute the makespans of the neighbours obtained by applying each move to the solution, which must be the current solution
+    # of the incremental evaluation. Every move is applied in place, evaluated and undone, so the solution is the same at the end
+    # (big enough groups are copied and evaluated together by the batch decoder instead)
+    def evaluate_moves(self, solution: Tuple[List[int], List[List[int]]], moves: List[Union[SwapMove, InsertMove, ReassignMove]]) -> List[int]:
+        if self.batch_decoder is not None and len(moves) >= self.settings.batch_threshold:
+            return self.evaluate_many([move.neighbor(solution) for move in moves])
+        makespans: List[int] = []
+        for move in moves:
+            move.apply(solution)
+            makespans.append(self.evaluate_move(solution, move))
+            move.undo(solution)
+        return makespans
+
+    # Will apply one of the moves given to evaluate_moves() to the current solution and make the result the new base of the incremental evaluation
+    def make_move(self, solution: Tuple[List[int], List[List[int]]], move: Union[SwapMove, InsertMove, ReassignMove]) -> int:
+        move.apply(solution)
+        makespan: int = self.incremental.evaluate_move(solution, move)   # Already counted by evaluate_moves(), we decode again only for the checkpoints
+        self.incremental.accept(solution[0])
+        return makespan
+
+    # Will apply the solution to the scheduler, filling the machine schedules and task times, and return its makespan
+    def materialize(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
         self.reset_scheduler() # Clear any existing schedule from previous computings
-        job_last_times: List[int] = [0] * len(self.jobs)        # When each job’s last operation finished, job_last_times[job_id] will give it to us
-        machine_times: List[int] = [0] * len(self.machines)     # When each machine becomes available, machine_times[machine_id] will give us the next available time
-        scheduled_tasks: List[int] = [0] * len(self.jobs)       # Number of operations scheduled per job, basically scheduled_tasks[job_id] will give us the index 
-                                                                # of the task of that needs to be executed for the current job
-
-        # We iterate through the solution with job ids
-        for job_id in operation_sequence:
-            if (scheduled_tasks[job_id] < len(self.jobs[job_id].operations)):
-                operation_index: int = scheduled_tasks[job_id]      # Next operation for this job
-                machine_id: int = machine_assignment[job_id][operation_index]       # Assigned machine id for the current operation of the job
-                operation_task_list: List[Task] = self.jobs[job_id].operations[operation_index]   # Possible tasks for this operation where we're gonna search the task with the machine_id
-
-                for task in operation_task_list:                    # Iterate through the curr task_list of the job to find the task with the needed machine id
-                    if (task.machine_id == machine_id):             # If we foun the task with the right machine
-                        duration: int = task.duration
-                        # Start when both the machine and job are ready
-                        start_time: int = max(machine_times[machine_id], job_last_times[job_id])    # We pick the start time which is the max between the machine availability
-                                                                                                    # and job last time, since we have to execute the previous tasks first
-                        end_time: int = start_time + duration       # We change the end time after completing the current task
-                        # Assign times to the task
-
-                        task.start_time = start_time    # We update the start time of the task because it's initially none      
-                        task.end_time = end_time        # We update the end time of the task because it's initially none
-                        break                           # We break because it should be executed only for the needed task and then stop
-                    
-                # Update machine and job availability
-                machine_times[machine_id] = end_time    # We update the time availability of the machine, we add the duration of the current task
-                job_last_times[job_id] = end_time       # We will update the last time in the job when it finished
-                self.machines[machine_id].add_to_schedule(job_id, start_time, end_time)     # We add the current task to machine's schedule
-                scheduled_tasks[job_id] += 1  # Move to the next operation for this job     # We move to the next operation for the current job
-
-        makespan: int = max(machine_times)  # Makespan is the latest machine finish time
+        makespan: int = 0
+        for job_id, operation_index, machine_id, start_time, end_time in self.decoder.schedule(operation_sequence, machine_assignment):
+            # Assign times to the task
+            task: Task = self.operation_tasks[self.instance.job_offsets[job_id] + operation_index][machine_id]
+            task.start_time = start_time
+            task.end_time = end_time
+            self.machines[machine_id].add_to_schedule(job_id, start_time, end_time)     # We add the current task to machine's schedule
+            makespan = max(makespan, end_time)
+
         self.global_max = makespan     # Update scheduler’s makespan
         return makespan
+
+    # Will compute the makespan for the encoded operations array and machine assignments and it also updates the scheduler with the computed solution
+    def compute_makespan(self, operation_sequence: List[int], machine_assignment: List[List[int]]) -> int:
+        return self.materialize(operation_sequence, machine_assignment)
     
-    #This function will generate a neighbour solution based on the encoded provided one
-    def generate_neighbor(self, solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
-        operation_sequence, machine_assignment = copy.deepcopy(solution)   # We separate the operation sequence and the maachines assigned
+    # This function picks a random move for the provided solution, either a swap of two positions or a machine change for one operation
+    def random_move(self, solution: Tuple[List[int], List[List[int]]]) -> Union[SwapMove, InsertMove, ReassignMove]:
+        operation_sequence, machine_assignment = solution   # We separate the operation sequence and the maachines assigned
         # Here we will decide if we swap two operations in the sequence or if we pick a different machine and task for a opperation
-        if random.random() < config.global_configs.operation_machine_ratio:
+        if random.random() < self.settings.operation_machine_ratio:
             # Option 1: Swap two operations in the sequence
-            new_sequence: List[int] = operation_sequence.copy()    # We make a copy of the current sequence
-            i, j = random.sample(range(len(new_sequence)), 2)   # Pick two random distinct positions from the new_sequence
-            new_sequence[i], new_sequence[j] = new_sequence[j], new_sequence[i]     # Swap the 2 positions so that we get a neighbour solution
-            return new_sequence, machine_assignment     # Return the solution tuple
-        else:
-            # Option 2: Change the machine for one operation
-            new_machine_assignment: List[List[int]] = copy.deepcopy(machine_assignment)  # Deep copy of the machine_assignment array
-
-            limit: int = 0  # Will be the limit for search, in case there are no operations with multiple machine options to be found
-            for job in self.jobs:   # We are making the limit equal to the sum of number of operations of each job doubled (not a rule, but I decided to just double)
-                limit += len(job.operations) * 2
-
-            while(limit > 0):
-                job_id = random.randint(0, len(self.jobs) - 1)      # Get a random job's index
-                operation_index = random.randint(0, len(self.jobs[job_id].operations) - 1)  # Get a andom operation's id from the selected job
-                task_list = self.jobs[job_id].operations[operation_index]     # Get the task list for the selected operation's index of the selecte job
-                if len(task_list) > 1:  # We make sure there’s a choice of machines
-                    current_machine = new_machine_assignment[job_id][operation_index]    # We get the selected machine operation from our copy of the machine assignments
-                    # Get all other possible machines except the already selected one
-                    possible_machines = [task.machine_id for task in task_list if task.machine_id != current_machine]
-                    new_machine = random.choice(possible_machines)  # We pick a random machine from the other options we have
-                    new_machine_assignment[job_id][operation_index] = new_machine    # We update the new machine for the operation in our new machine assignment
-                    break
-                limit -= 1
+            i, j = random.sample(range(len(operation_sequence)), 2)   # Pick two random distinct positions from the sequence
+            return SwapMove(i, j)
+
+        # Option 2: Change the machine for one operation, picked from the operations with multiple machine options (computed once by the instance)
+        flexible_operations: List[int] = self.instance.flexible_operations
+        if flexible_operations:
+            global_operation: int = random.choice(flexible_operations)
+            job_id: int = self.instance.operation_job[global_operation]
+            operation_index: int = global_operation - self.instance.job_offsets[job_id]
+            current_machine = machine_assignment[job_id][operation_index]    # We get the selected machine of the operation
+            # Get all other possible machines except the already selected one
+            possible_machines = [machine_id for machine_id in self.instance.eligible_machines[global_operation] if machine_id != current_machine]
+            return ReassignMove(job_id, operation_index, random.choice(possible_machines))  # We pick a random machine from the other options we have
+
+        # No operation with multiple machines exists, so we swap instead of returning the same solution
+        i, j = random.sample(range(len(operation_sequence)), 2)
+        return SwapMove(i, j)
+
+    # This function returns the moves of the critical path neighbourhood of the solution, the only moves that can reduce the makespan
+    # (swaps and insertions at the ends of the critical blocks and reassignments of the critical operations to other machines)
+    def critical_moves(self, solution: Tuple[List[int], List[List[int]]]) -> List[Union[SwapMove, InsertMove, ReassignMove]]:
+        return critical_path_moves(self.instance, solution)
+
+    # Returns the moves used by a heuristic, neighborhood is 'random' (count random moves) or 'critical' (the whole critical path neighbourhood)
+    def generate_moves(self, solution: Tuple[List[int], List[List[int]]], count: int, neighborhood: str) -> List[Union[SwapMove, InsertMove, ReassignMove]]:
+        if neighborhood == 'critical':
+            moves: List[Union[SwapMove, InsertMove, ReassignMove]] = self.critical_moves(solution)
+            if moves:
+                return moves
+        elif neighborhood != 'random':
+            raise ValueError(f"Unknown neighborhood: {neighborhood}")
+        return [self.random_move(solution) for _ in range(count)]     # In case the critical neighbourhood is empty we still return random moves
+
+    # Same as generate_moves() but returns the neighbour solutions
+    def generate_neighbors(self, solution: Tuple[List[int], List[List[int]]], count: int, neighborhood: str) -> List[Tuple[List[int], List[List[int]]]]:
+        return [move.neighbor(solution) for move in self.generate_moves(solution, count, neighborhood)]
 
-            return operation_sequence, new_machine_assignment   # Return the solution tuple
+    #This function will generate a neighbour solution based on the encoded provided one
+    def generate_neighbor(self, solution: Tuple[List[int], List[List[int]]]) -> Tuple[List[int], List[List[int]]]:
+        return self.random_move(solution).neighbor(solution)     # The move returns a new solution tuple, the provided one is not modified
         
-    def simulated_annealing(self,
-                            initial_temperature: float = config.simulated_annealing.initial_temperature, 
-                            cooling_rate: float = config.simulated_annealing.cooling_rate, 
-                            min_temperature: float = config.simulated_annealing.min_temperature, 
-                            max_iterations: int = config.simulated_annealing.max_iterations,
-                            restarts: int = config.simulated_annealing.restarts
-                            ) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+    # The parameters of every heuristic are the section of config.json by default, a run can pass it's own (see configModels.py)
+    def simulated_annealing(self, params: Optional[SimulatedAnnealingConfig] = None) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        params = params if params is not None else config.simulated_annealing
+
+        if params.mode == 'tempering':
+            return self.parallel_tempering(params)
+        if params.mode == 'budget':
+            return self.budgeted_annealing(params)
 
         best_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()     # Track the best solution found
-        best_makespan: int = self.compute_makespan(*best_solution)                              # Track its makespan
-
-        for i in range(restarts):
-            current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
-            current_makespan: int = self.compute_makespan(current_solution[0], current_solution[1])             # Evaluate it
-            temperature: int = initial_temperature   # Start with a high temperature
-            iteration: int = 0                       # Count iterations
-
-            # We continue until temperature is low enough or max iterations reached
-            while temperature > min_temperature and iteration < max_iterations:
-                neighbor: Tuple[List[int], List[List[int]]] = self.generate_neighbor(current_solution)     # Create a new solution
-                neighbor_makespan: int = self.compute_makespan(*neighbor)    # Evaluate it
-                delta_E: int = neighbor_makespan - current_makespan          # Change in makespan
-                # Accept if better (negative delta) or with probability if worse
-                if delta_E < 0 or random.random() < math.exp(-delta_E / (temperature * current_makespan)):  
-                    current_solution = neighbor
+        best_makespan: int = self.evaluate(*best_solution)                              # Track its makespan
+
+        # The restarts are independent, so we either run them one after another or spread them over the worker processes
+        if self.settings.workers > 1 and params.restarts > 1:
+            from parallel import run_parallel_restarts     # Imported here because the parallel module needs the Scheduler class
+            results = run_parallel_restarts(self, 'simulated_annealing_restart', params.restarts, self.settings.workers, self.settings.seed,
+                                            {'params': params})
+        else:
+            # A generator, so we don't start new restarts once the budget ran out
+            results = (self.simulated_annealing_restart(params) for _ in range(params.restarts) if not self.monitor.should_stop())
+
+        for solution, makespan in results:
+            # Update best solution if this one is better
+            if makespan < best_makespan:
+                best_solution = solution
+                best_makespan = makespan
+
+        self.materialize(*best_solution)  # Apply the best solution
+        return best_solution, best_makespan    # Return the optimized solution and its makespan
+
+    # One annealing chain starting from a random solution, returns the best solution of the chain and its makespan
+    def simulated_annealing_restart(self, params: SimulatedAnnealingConfig) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
+        current_makespan: int = self.set_current_solution(current_solution)     # Evaluate it and keep it as the base for the incremental evaluation
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(current_solution)
+        best_makespan: int = current_makespan
+        temperature: float = params.initial_temperature    # Start with a high temperature
+        iteration: int = 0                       # Count iterations
+
+        # We continue until temperature is low enough, max iterations reached or the budget ran out
+        while temperature > params.min_temperature and iteration < params.max_iterations and not self.monitor.should_stop():
+            move = self.random_move(current_solution)
+            move.apply(current_solution)     # The current solution becomes the neighbour, we undo the move if it's rejected
+            neighbor_makespan: int = self.evaluate_move(current_solution, move)    # Evaluate it only from the first changed position
+            delta_E: int = neighbor_makespan - current_makespan          # Change in makespan
+            if self.accept_move(delta_E, temperature, current_makespan):
+                current_makespan = neighbor_makespan
+                self.incremental.accept(current_solution[0])    # The neighbour becomes the base for the next moves
+                # Update best solution if this one is better, it's the only place where we copy the solution
+                if current_makespan < best_makespan:
+                    best_solution = copy_solution(current_solution)
+                    best_makespan = current_makespan
+            else:
+                move.undo(current_solution)
+            temperature *= params.cooling_rate  # Cool down the temperature
+            iteration += 1               # Increment iteration counter
+
+        return best_solution, best_makespan
+
+    # The acceptance rule of Simulated Annealing: accept if better (negative delta) or with probability if worse, the probability
+    # depends on the increase relative to the current makespan, so the temperatures mean the same on small and large instances
+    def accept_move(self, delta_E: int, temperature: float, current_makespan: int) -> bool:
+        return delta_E < 0 or random.random() < math.exp(-delta_E / (temperature * current_makespan))
+
+    # Simulated Annealing driven by an evaluation budget: one chain doing chain_length moves at every temperature. The first and last
+    # temperatures are calibrated on a sample of random moves of the instance, so initial_acceptance and final_acceptance of the worse
+    # moves are accepted, and the cooling rate is derived from the budget so the schedule ends when the budget runs out. The effort
+    # then only depends on the budget, whatever the size of the instance (initial_temperature, cooling_rate, min_temperature and
+    # max_iterations are not used, the temperatures only fall back to them if no sampled move is worse)
+    def budgeted_annealing(self, params: SimulatedAnnealingConfig) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        budget: int = params.evaluation_budget
+        if self.monitor.evaluation_limit is not None:
+            budget = min(budget, self.monitor.evaluation_limit - self.monitor.evaluations)
+        last_evaluation: int = self.evaluations + budget    # Value of evaluations when the chain stops
+
+        current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
+        current_makespan: int = self.set_current_solution(current_solution)
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(current_solution)
+        best_makespan: int = current_makespan
+
+        # The sampled moves are evaluated from the initial solution and not applied
+        sample_size: int = max(0, min(params.calibration_samples, last_evaluation - self.evaluations))
+        samples: List[int] = self.evaluate_moves(current_solution, [self.random_move(current_solution) for _ in range(sample_size)])
+        relative_deltas: List[float] = [(makespan - current_makespan) / current_makespan for makespan in samples if makespan > current_makespan]
+        if relative_deltas:
+            initial_temperature: float = calibrate_temperature(relative_deltas, params.initial_acceptance)
+            final_temperature: float = calibrate_temperature(relative_deltas, params.final_acceptance)
+        else:
+            initial_temperature, final_temperature = params.initial_temperature, max(params.min_temperature, params.initial_temperature * 1e-3)
+        levels: int = max(1, (last_evaluation - self.evaluations) // params.chain_length)
+        cooling: float = cooling_rate(initial_temperature, final_temperature, levels)
+
+        temperature: float = initial_temperature
+        while self.evaluations < last_evaluation and not self.monitor.should_stop():
+            for _ in range(min(params.chain_length, last_evaluation - self.evaluations)):
+                move = self.random_move(current_solution)
+                move.apply(current_solution)
+                neighbor_makespan: int = self.evaluate_move(current_solution, move)
+                if self.accept_move(neighbor_makespan - current_makespan, temperature, current_makespan):
                     current_makespan = neighbor_makespan
-                    # Update best solution if this one is better
+                    self.incremental.accept(current_solution[0])
                     if current_makespan < best_makespan:
-                        best_solution = current_solution
+                        best_solution = copy_solution(current_solution)
                         best_makespan = current_makespan
-                temperature *= cooling_rate  # Cool down the temperature    
-                iteration += 1               # Increment iteration counter
-        
+                else:
+                    move.undo(current_solution)
+                if self.monitor.should_stop():
+                    break
+            temperature *= cooling
 
-        self.compute_makespan(*best_solution)  # Apply the best solution
-        return best_solution, best_makespan    # Return the optimized solution and its makespan
+        self.materialize(*best_solution)  # Apply the best solution
+        return best_solution, best_makespan
+
+    # Parallel tempering (replica exchange): replicas replicas run at fixed temperatures, spaced geometrically from tempering_min_temperature
+    # to tempering_max_temperature (the ladder has it's own temperatures, the relative acceptance rule makes even the coldest temperature
+    # of the default cooling schedule a random walk). Every exchange_interval moves the neighbouring replicas can swap their states, so the good solutions
+    # found by the hot replicas move down to the cold ones, which improve them, instead of starting every chain again from a random solution
+    # Every replica does max_iterations moves in total, with global_configs.workers above 1 the replicas run in the worker processes
+    def parallel_tempering(self, params: SimulatedAnnealingConfig) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        replicas: int = params.replicas
+        ratio: float = (params.tempering_max_temperature / params.tempering_min_temperature) ** (1 / (replicas - 1))
+        temperatures: List[float] = [params.tempering_min_temperature * ratio ** replica for replica in range(replicas)]   # The coldest first
+
+        states: List[Tuple[List[int], List[List[int]]]] = [self.generate_initial_solution() for _ in range(replicas)]
+        makespans: List[int] = self.evaluate_many(states)
+        best_replica: int = min(range(replicas), key = lambda replica: makespans[replica])
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(states[best_replica])
+        best_makespan: int = makespans[best_replica]
+
+        epochs: int = (params.max_iterations + params.exchange_interval - 1) // params.exchange_interval
+        pool = None
+        if self.settings.workers > 1:
+            from parallel import create_pool, derive_seeds, run_method     # Imported here because the parallel module needs the Scheduler class
+            seeds: List[int] = derive_seeds(self.settings.seed, epochs * replicas)
+            pool = create_pool(self, min(self.settings.workers, replicas))
+        try:
+            for epoch in range(epochs):
+                if self.monitor.should_stop():
+                    break
+                moves: int = min(params.exchange_interval, params.max_iterations - epoch * params.exchange_interval)
+                if pool is not None:
+                    budget: Dict = self.monitor.worker_budget(replicas)    # The replicas share what is left of the budget
+                    futures = [
+                        pool.submit(run_method, 'tempering_chain', seeds[epoch * replicas + replica],
+                                    {'solution': states[replica], 'makespan': makespans[replica], 'temperature': temperatures[replica],
+                                     'moves': moves}, budget, self.monitor.target)
+                        for replica in range(replicas)
+                    ]
+                    results = []
+                    for future in futures:
+                        result, evaluations, target_reached_at = future.result()
+                        self.evaluations += evaluations     # We count the evaluations done by the workers too
+                        self.monitor.record_target(target_reached_at)
+                        self.monitor.record(result[3], evaluations)     # The result ends with the best makespan of the chain
+                        results.append(result)
+                else:
+                    results = [self.tempering_chain(states[replica], makespans[replica], temperatures[replica], moves) for replica in range(replicas)]
+
+                for replica, (solution, makespan, chain_best_solution, chain_best_makespan) in enumerate(results):
+                    states[replica] = solution
+                    makespans[replica] = makespan
+                    if chain_best_makespan < best_makespan:
+                        best_solution = chain_best_solution
+                        best_makespan = chain_best_makespan
+                self.exchange_replicas(states, makespans, temperatures, epoch % 2)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.materialize(*best_solution)  # Apply the best solution
+        return best_solution, best_makespan
+
+    # One replica of parallel tempering, does moves moves at a fixed temperature from the solution (already evaluated, with the makespan)
+    # Returns the solution where the replica stopped with it's makespan and the best solution it found with it's makespan
+    def tempering_chain(self, solution: Tuple[List[int], List[List[int]]], makespan: int, temperature: float, moves: int
+                        ) -> Tuple[Tuple[List[int], List[List[int]]], int, Tuple[List[int], List[List[int]]], int]:
+        current_solution: Tuple[List[int], List[List[int]]] = solution     # Modified in place, the replica owns it's state
+        current_makespan: int = makespan
+        self.incremental.set_base(*current_solution)    # Not counted, the solution was evaluated before, we only need the base of the moves
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(current_solution)
+        best_makespan: int = current_makespan
+
+        for _ in range(moves):
+            if self.monitor.should_stop():
+                break
+            move = self.random_move(current_solution)
+            move.apply(current_solution)
+            neighbor_makespan: int = self.evaluate_move(current_solution, move)
+            if self.accept_move(neighbor_makespan - current_makespan, temperature, current_makespan):
+                current_makespan = neighbor_makespan
+                self.incremental.accept(current_solution[0])
+                if current_makespan < best_makespan:
+                    best_solution = copy_solution(current_solution)
+                    best_makespan = current_makespan
+            else:
+                move.undo(current_solution)
+
+        return current_solution, current_makespan, best_solution, best_makespan
+
+    # The exchange step of parallel tempering, the pairs of neighbouring temperatures starting at first (0 or 1, so the pairs alternate)
+    # swap their states with the Metropolis probability min(1, exp((1/T_i - 1/T_j) * (E_i - E_j))). Like in the acceptance rule the
+    # makespans are taken relative to the smaller one, so a better state at the hotter temperature always moves to the colder one
+    def exchange_replicas(self, states: List[Tuple[List[int], List[List[int]]]], makespans: List[int], temperatures: List[float],
+                          first: int) -> None:
+        for i in range(first, len(states) - 1, 2):
+            j: int = i + 1
+            exponent: float = (1 / temperatures[i] - 1 / temperatures[j]) * (makespans[i] - makespans[j]) / max(1, min(makespans[i], makespans[j]))
+            if exponent >= 0 or random.random() < math.exp(exponent):
+                states[i], states[j] = states[j], states[i]
+                makespans[i], makespans[j] = makespans[j], makespans[i]
+
+    def hill_climbing(self, params: Optional[HillClimbingConfig] = None) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        params = params if params is not None else config.hill_climbing
 
-    def hill_climbing(self, 
-                      improvement_tries: int = config.hill_climbing.improvement_tries,
-                      max_iterations: int = config.hill_climbing.max_iterations,
-                      restarts: int = config.hill_climbing.restarts
-                      ) -> Tuple[Tuple[List[int], List[List[int]]], int]:
-        
         # Initialize the best solution and its makespan
         best_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
-        best_makespan: int = self.compute_makespan(*best_solution)
+        best_makespan: int = self.evaluate(*best_solution)
 
-        # We'll do restart tries
-        for i in range(restarts):
-            current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
-            current_makespan: int = self.compute_makespan(*current_solution)    # Compute the makespan of the current solution
-            
-            improvement_attempts: int = improvement_tries  # We give tries to find a better neighbour, if not found we consider the currens solution as local optimum
-            # We iterate till the max or as long as we get improvements
-            for j in range(max_iterations):
-                if improvement_attempts == 0:
-                    break
-                # We generate some random list of neighbours and their makespans
-                neighbors: List[Tuple[List[int], List[List[int]]]] = [self.generate_neighbor(current_solution) for _ in range(config.hill_climbing.neighbors_number)]
-                neighbor_makespans = [self.compute_makespan(*neigh) for neigh in neighbors]
-                # We determine the best solution
-                neighbors_best_solution: Tuple[List[int], List[List[int]]] = neighbors[0]
-                neighbors_best_makespan: int = neighbor_makespans[0]
-                for index in range(len(neighbor_makespans)):
-                    if(neighbor_makespans[index] < neighbors_best_makespan):
-                        neighbors_best_makespan = neighbor_makespans[index]
-                        neighbors_best_solution = neighbors[index]
-
-                # Check if we got an improvement
-                if neighbors_best_makespan < current_makespan:
-                    current_solution = copy.deepcopy(neighbors_best_solution)
-                    current_makespan = neighbors_best_makespan
-                else:
-                    improvement_attempts -= 1
-            
+        # We'll do restart tries, in parallel if we have more workers
+        if self.settings.workers > 1 and params.restarts > 1:
+            from parallel import run_parallel_restarts     # Imported here because the parallel module needs the Scheduler class
+            results = run_parallel_restarts(self, 'hill_climbing_restart', params.restarts, self.settings.workers, self.settings.seed,
+                                            {'params': params})
+        else:
+            # A generator, so we don't start new restarts once the budget ran out
+            results = (self.hill_climbing_restart(params) for _ in range(params.restarts) if not self.monitor.should_stop())
+
+        for solution, makespan in results:
             # We check if the found solution is better than our best
-            if current_makespan < best_makespan:
-                best_solution = current_solution
-                best_makespan = current_makespan
+            if makespan < best_makespan:
+                best_solution = solution
+                best_makespan = makespan
                         
         # Apply the best solution to update the scheduler and return it
-        self.compute_makespan(*best_solution)
+        self.materialize(*best_solution)
         return best_solution, best_makespan
+
+    # One climb starting from a random solution, returns the local optimum it reached and its makespan
+    def hill_climbing_restart(self, params: HillClimbingConfig) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        if params.mode != 'sampled':
+            return self.systematic_climb(params)
+        neighborhood: str = params.neighborhood
+        current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
+        current_makespan: int = self.set_current_solution(current_solution)    # Compute the makespan of the current solution, the neighbours are evaluated from it
         
-    # Tabu search which generates random solutions and the picks the better ones that are not in the tabu list (forbidden list)
-    # In this function we check the moves only by the operation sequence, we don't check the difference for the machines, to consume less time
-    def tabu_search(self,
-                    tabu_tenure: int = config.tabu_search.tabu_tenure, 
-                    max_iterations: int = config.tabu_search.max_iterations
-                    ) -> Tuple[Tuple[List[int], List[List[int]]], int]:
-        
+        improvement_attempts: int = params.improvement_tries  # We give tries to find a better neighbour, if not found we consider the currens solution as local optimum
+        # We iterate till the max or as long as we get improvements
+        for j in range(params.max_iterations):
+            if improvement_attempts == 0 or self.monitor.should_stop():
+                break
+            # We generate some random moves (or the critical path neighbourhood) and the makespans of the neighbours they give
+            moves: List[Union[SwapMove, InsertMove, ReassignMove]] = self.generate_moves(current_solution, params.neighbors_number, neighborhood)
+            neighbor_makespans: List[int] = self.evaluate_moves(current_solution, moves)
+            # We determine the best move
+            best_move_index: int = 0
+            for index in range(len(neighbor_makespans)):
+                if(neighbor_makespans[index] < neighbor_makespans[best_move_index]):
+                    best_move_index = index
+
+            # Check if we got an improvement
+            if neighbor_makespans[best_move_index] < current_makespan:
+                current_makespan = self.make_move(current_solution, moves[best_move_index])
+            elif neighborhood == 'critical':
+                break   # We evaluated the whole critical neighbourhood, so we are in a local optimum
+            else:
+                improvement_attempts -= 1
+
+        return current_solution, current_makespan
+
+    # Systematic climb starting from a random solution: the swap and reassignment neighbourhood is enumerated by position of the
+    # operation sequence, the positions and their moves in a random order. first_improvement applies the first better neighbour of a
+    # position, best_improvement the best neighbour of the whole sweep. With dont_look_bits a position whose moves gave no better
+    # neighbour is skipped until an applied move touches it again. The climb stops exactly at a local optimum (or when the budget
+    # runs out): once a sweep of all the positions of the current solution finds no better neighbour
+    def systematic_climb(self, params: HillClimbingConfig) -> Tuple[Tuple[List[int], List[List[int]]], int]:
         current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
-        current_makespan: int = self.compute_makespan(*current_solution)                        # We calculate the current makespan
-        best_solution: Tuple[List[int], List[List[int]]] = copy.deepcopy(current_solution)      # Keeping the best solution
+        current_makespan: int = self.set_current_solution(current_solution)
+        size: int = len(current_solution[0])
+        dont_look: List[bool] = [False] * size
+        improved: bool = False      # A move was applied since the bits were last cleared
+
+        while not self.monitor.should_stop():
+            positions: List[int] = [position for position in range(size) if not dont_look[position]]
+            if not positions:
+                # All the positions were checked since the last improvement, so none of the neighbours of the current solution is better
+                if not improved:
+                    break
+                dont_look = [False] * size
+                improved = False
+                continue
+            random.shuffle(positions)
+
+            best_move: Optional[Union[SwapMove, ReassignMove]] = None     # The best move of the sweep, for best_improvement
+            best_position: int = 0
+            best_makespan: int = current_makespan
+            for position in positions:
+                if self.monitor.should_stop():
+                    break
+                moves: List[Union[SwapMove, ReassignMove]] = self.position_moves(current_solution, position)
+                random.shuffle(moves)
+                found: bool = False
+                if params.mode == 'first_improvement':
+                    # The moves are evaluated one by one and the first better one is kept
+                    for move in moves:
+                        move.apply(current_solution)
+                        neighbor_makespan: int = self.evaluate_move(current_solution, move)
+                        if neighbor_makespan < current_makespan:
+                            current_makespan = neighbor_makespan
+                            self.incremental.accept(current_solution[0])
+                            self.touch_positions(dont_look, move, position)
+                            found = improved = True
+                            break
+                        move.undo(current_solution)
+                else:
+                    for move, neighbor_makespan in zip(moves, self.evaluate_moves(current_solution, moves)):
+                        if neighbor_makespan < current_makespan:
+                            found = True
+                        if neighbor_makespan < best_makespan:
+                            best_move, best_position, best_makespan = move, position, neighbor_makespan
+                if not found:
+                    dont_look[position] = True
+
+            if best_move is not None:
+                current_makespan = self.make_move(current_solution, best_move)
+                self.touch_positions(dont_look, best_move, best_position)
+                improved = True
+            if not params.dont_look_bits and improved:
+                # Without the bits every sweep checks all the positions again
+                dont_look = [False] * size
+                improved = False
+
+        return current_solution, current_makespan
+
+    # The moves of the systematic neighbourhood which involve the position of the operation sequence: the swaps with every position
+    # holding another job (swapping two operations of the same job changes nothing) and the reassignments of the operation at the
+    # position to it's other machines
+    def position_moves(self, solution: Tuple[List[int], List[List[int]]], position: int) -> List[Union[SwapMove, ReassignMove]]:
+        operation_sequence, machine_assignment = solution
+        job_id: int = operation_sequence[position]
+        moves: List[Union[SwapMove, ReassignMove]] = [
+            SwapMove(position, other) for other in range(len(operation_sequence)) if operation_sequence[other] != job_id
+        ]
+        operation_index: int = operation_sequence[:position].count(job_id)    # The operation at the position is the operation_index-th of it's job
+        current_machine: int = machine_assignment[job_id][operation_index]
+        for machine_id in self.instance.eligible_machines[self.instance.job_offsets[job_id] + operation_index]:
+            if machine_id != current_machine:
+                moves.append(ReassignMove(job_id, operation_index, machine_id))
+        return moves
+
+    # Clears the don't look bits of the positions changed by an applied move, found from position
+    def touch_positions(self, dont_look: List[bool], move: Union[SwapMove, ReassignMove], position: int) -> None:
+        dont_look[position] = False
+        if isinstance(move, SwapMove):
+            dont_look[move.first] = False
+            dont_look[move.second] = False
+
+    # Tabu search which generates random solutions and the picks the better ones that are not tabu (forbidden)
+    # The tabu memory keeps small attributes of the recent moves (the pair of operations which changed order, or the old machine of a
+    # reassigned operation) with the iteration when they expire, so checking a move doesn't depend on the size of the solution
+    def tabu_search(self, params: Optional[TabuSearchConfig] = None) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        params = params if params is not None else config.tabu_search
+
+        current_solution: Tuple[List[int], List[List[int]]] = self.generate_initial_solution()
+        current_makespan: int = self.set_current_solution(current_solution)             # We calculate the current makespan, the moves are evaluated from it
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(current_solution)      # Keeping the best solution
         best_makespan: int = current_makespan                                                   # Keeping the best makespan for the best solution
-        # Tabu list to store recent moves (tuples of sequences)
-        tabu_list: Deque[Tuple[List[int], List[int]]] = deque(maxlen = tabu_tenure)             # Tabu list with fixed size (will automatically eliminate when exceeded)
+        tabu_memory: TabuMemory = TabuMemory(params.tabu_tenure)       # Tabu attributes of the recent moves with their expiry iterations
 
-        for iteration in range(max_iterations):
-            # Generate 15 neighbors
-            neighbors: List[Tuple[List[int], List[List[int]]]] = [self.generate_neighbor(current_solution) for _ in range(15)]
+        for iteration in range(params.max_iterations):
+            if self.monitor.should_stop():
+                break
+            # Generate candidate_list_size random moves (or the whole critical path neighbourhood)
+            moves: List[Union[SwapMove, InsertMove, ReassignMove]] = self.generate_moves(current_solution, params.candidate_list_size, params.neighborhood)
+            neighbor_makespans: List[int] = self.evaluate_moves(current_solution, moves)     # Calculate the makespans of the neighbours
+            sequence_operations: List[int] = self.instance.sequence_operations(current_solution[0])  # Global operation at every position, for the move attributes
 
             # Find the best non-tabu neighbor
-            best_neighbor: Optional[Tuple[List[int], List[List[int]]]] = None       # Will keep the best neighbour
+            best_move: Optional[Union[SwapMove, InsertMove, ReassignMove]] = None   # Will keep the move to the best neighbour
             best_neighbor_makespan: float = float('inf')                            # Best makespan initially is the maximum value bc we need to compute the minimum
-            best_move: Optional[Tuple[List[int], List[int]]] = None                 
+            best_tabu_attribute: Optional[Hashable] = None                          # The attribute that becomes tabu if we make the best move
 
             # Iterate through the neighbours
-            for neighbor in neighbors:
-                neighbor_makespan: int = self.compute_makespan(*neighbor)           # Calculate their makespan
-                # Simplified move representation: tuple of operation sequences (before, after), e.g. ([0, 1, 0, 1], [1, 0, 0, 1])
-                move: Tuple[List[int], List[int]] = (current_solution[0][:], neighbor[0][:])  # Only sequence for simplicity not machine list
+            for move, neighbor_makespan in zip(moves, neighbor_makespans):
+                if neighbor_makespan >= best_neighbor_makespan:
+                    continue
+                move_attribute, tabu_attribute = move_attributes(move, sequence_operations, self.instance.job_offsets, current_solution[1])
                 # Check if move is allowed (not tabu or meets aspiration criteria)
-                if move not in tabu_list or neighbor_makespan < best_makespan:
-                    if neighbor_makespan < best_neighbor_makespan:
-                        best_neighbor = neighbor
-                        best_neighbor_makespan = float(neighbor_makespan)  # Convert to float for consistency
-                        best_move = move
+                if not tabu_memory.is_tabu(move_attribute, iteration) or neighbor_makespan < best_makespan:
+                    best_move = move
+                    best_neighbor_makespan = float(neighbor_makespan)  # Convert to float for consistency
+                    best_tabu_attribute = tabu_attribute
             
-            # If no valid move is found, terminate the loop
-            if best_neighbor is None:
-                break
+            # Every move is tabu and none of them meets the aspiration criteria (it happens with the small critical neighbourhood), so instead
+            # of stopping we make the move which stops being tabu first, the best one of them on equal expiries
+            if best_move is None:
+                best_expiry: int = 0
+                for move, neighbor_makespan in zip(moves, neighbor_makespans):
+                    move_attribute, tabu_attribute = move_attributes(move, sequence_operations, self.instance.job_offsets, current_solution[1])
+                    expiry: int = tabu_memory.expiry_of(move_attribute)
+                    if best_move is None or (expiry, neighbor_makespan) < (best_expiry, best_neighbor_makespan):
+                        best_move = move
+                        best_expiry = expiry
+                        best_neighbor_makespan = float(neighbor_makespan)
+                        best_tabu_attribute = tabu_attribute
+                if best_move is None:
+                    break   # No moves at all
 
             # Update current solution
-            current_solution = copy.deepcopy(best_neighbor)
-            current_makespan = int(best_neighbor_makespan)  # Convert back to int
+            current_makespan = self.make_move(current_solution, best_move)
             
             # Update best solution if improved
             if current_makespan < best_makespan:
-                best_solution = copy.deepcopy(current_solution)
+                best_solution = copy_solution(current_solution)
                 best_makespan = current_makespan
             
-            # Add move to tabu list
-            tabu_list.append(best_move)
-
-            # Increment iteration
-            iteration += 1
+            # The attribute of the move we made becomes tabu
+            tabu_memory.add(best_tabu_attribute, iteration)
 
         # Apply the best solution and return
-        self.compute_makespan(*best_solution)
+        self.materialize(*best_solution)
         return best_solution, best_makespan
     
     ### Todo: add the number of the best solutions carried to the next level ###
     # Here we implement the Genetic Algorithm heuristic
-    def genetic_algorithm(self,
-                          population_size: int = max(config.genetic_algorithm.population_size, 2), # We neet at leas 2 parents
-                          num_generations: int = config.genetic_algorithm.num_generations,
-                          crossover_rate: float = config.genetic_algorithm.crossover_rate,
-                          mutation_rate: float = config.genetic_algorithm.mutation_rate,
-                          tournament_size: int = config.genetic_algorithm.tournament_size
-                          ) -> Tuple[Tuple[List[int], List[List[int]]], int]:
-        
-        
-        # Creates a population of solutions and evolves them over generations
-        # Initialize a population of random solutions initially
-        population: List[Tuple[List[int], List[List[int]]]] = [self.generate_initial_solution() for _ in range(population_size)]
+    def genetic_algorithm(self, params: Optional[GeneticAlgorithmConfig] = None) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        params = params if params is not None else config.genetic_algorithm
+        population_size: int = params.population_size      # At least 2, checked by the config
+        num_generations: int = params.num_generations
+
+        generation_arguments: Dict = {
+            'crossover_rate': params.crossover_rate,
+            'mutation_rate': params.mutation_rate,
+            'tournament_size': params.tournament_size
+        }
+        if params.islands > 1:
+            # Island model, every island evolves it's own population in a separate process
+            populations, population_fitnesses = self.island_genetic_algorithm(population_size, num_generations, params.islands,
+                                                                              params.migration_interval, params.migrants,
+                                                                              params.migration_topology, self.settings.seed, generation_arguments)
+        else:
+            # Creates a population of solutions and evolves them over generations
+            # Initialize a population of random solutions initially
+            population: List[Tuple[List[int], List[List[int]]]] = [self.generate_initial_solution() for _ in range(population_size)]
+            # Evaluate fitness (makespan) for each solutions
+            fitnesses: List[int] = self.evaluate_many(population)
+            population, fitnesses = self.genetic_algorithm_generations(population, fitnesses, num_generations, **generation_arguments)
+            populations, population_fitnesses = [population], [fitnesses]
+
+        # Because of elitism the best solution found is always in the last population, so we pick the best from there
+        best_solution: Tuple[List[int], List[List[int]]] = populations[0][0]
+        best_makespan: int = population_fitnesses[0][0]
+        for population, fitnesses in zip(populations, population_fitnesses):
+            for ind in range(len(population)):
+                if(fitnesses[ind] < best_makespan):
+                    best_solution = population[ind]
+                    best_makespan = fitnesses[ind]
         
-        # Evaluate fitness (makespan) for each solutions
-        fitnesses: List[int] = [self.compute_makespan(*solution) for solution in population]
+        # Apply the best solution to the scheduler and return it
+        self.materialize(*best_solution)
+        return best_solution, best_makespan
+
+    # Evolves the population for the given number of generations and returns the last population with it's fitnesses
+    def genetic_algorithm_generations(self, population: List[Tuple[List[int], List[List[int]]]], fitnesses: List[int], num_generations: int,
+                                      crossover_rate: float, mutation_rate: float, tournament_size: int
+                                      ) -> Tuple[List[Tuple[List[int], List[List[int]]]], List[int]]:
+        population_size: int = len(population)
+        # The GA never modifies a solution in place (crossover and mutation build new ones), so the population can share solutions without copies
         # Initially best solution will be the first generated solution
-        best_solution: Tuple[List[int], List[List[int]]] = copy.deepcopy(population[0])  
+        best_solution: Tuple[List[int], List[List[int]]] = population[0]
         best_makespan: int = fitnesses[0]
         
         # Compare and get the best solution from the existing ones
         for ind in range(population_size):
             if(fitnesses[ind] < best_makespan):
                 # Keep the best solution from all
-                best_solution = copy.deepcopy(population[ind])
+                best_solution = population[ind]
                 best_makespan: int = fitnesses[ind]
 
-        # We repeat the proces num_generations times
+        # We repeat the proces num_generations times, or until the budget runs out
         for generation in range(num_generations):
+            if self.monitor.should_stop():
+                break
             # Initialize the new population
             new_population: List[Tuple[List[int], List[List[int]]]] = []
 
             # Elitism: Always carry over the best solution to the new population
-            new_population.append(copy.deepcopy(best_solution))
+            new_population.append(best_solution)
 
             # Fill the new population with offspring (kids)
             while len(new_population) < population_size:
@@ -446,7 +774,7 @@ class Scheduler:
                 if(random.random() < crossover_rate):
                     offspring: Tuple[List[int], List[List[int]]] = self.crossover(parent1, parent2)
                 else:
-                    if(self.compute_makespan(*parent1) < self.compute_makespan(*parent2)):
+                    if(self.evaluate(*parent1) < self.evaluate(*parent2)):
                         offspring = parent1
                     else:
                         offspring = parent2
@@ -460,19 +788,85 @@ class Scheduler:
             
             # Replace the old population with the new one
             population = new_population
-            fitnesses = [self.compute_makespan(*solution) for solution in population]
+            fitnesses = self.evaluate_many(population)
 
             # Check if there is a better solution, and if there is update the best solution
             for ind in range(population_size):
                 if(fitnesses[ind] < best_makespan):
                     # Keep the best solution from all
-                    best_solution = copy.deepcopy(population[ind])
+                    best_solution = population[ind]
                     best_makespan: int = fitnesses[ind]
-        
-        # Apply the best solution to the scheduler and return it
-        self.compute_makespan(*best_solution)
-        return best_solution, best_makespan
-                    
+
+        return population, fitnesses
+
+    # Island model of the Genetic Algorithm, every island evolves migration_interval generations in a worker process and
+    # then the best migrants of every island replace the worst individuals of the islands it's connected to
+    def island_genetic_algorithm(self, population_size: int, num_generations: int, islands: int, migration_interval: int, migrants: int,
+                                 migration_topology: str, seed: Optional[int], generation_arguments: Dict
+                                 ) -> Tuple[List[List[Tuple[List[int], List[List[int]]]]], List[List[int]]]:
+        from parallel import create_pool, derive_seeds, run_method     # Imported here because the parallel module needs the Scheduler class
+
+        if migration_topology not in ('ring', 'fully_connected'):
+            raise ValueError(f"Unknown migration topology: {migration_topology}")
+        migration_interval = max(migration_interval, 1)
+        migrants = min(migrants, population_size - 1)   # We keep at least one individual of the island
+
+        populations: List[List[Tuple[List[int], List[List[int]]]]] = [
+            [self.generate_initial_solution() for _ in range(population_size)] for _ in range(islands)
+        ]
+        population_fitnesses: List[List[int]] = [self.evaluate_many(population) for population in populations]
+
+        epochs: int = (num_generations + migration_interval - 1) // migration_interval
+        seeds: List[int] = derive_seeds(seed, epochs * islands)
+        with create_pool(self, islands) as pool:
+            for epoch in range(epochs):
+                if self.monitor.should_stop():
+                    break
+                generations: int = min(migration_interval, num_generations - epoch * migration_interval)
+                budget: Dict = self.monitor.worker_budget(islands)      # The islands share what is left of the budget
+                futures = [
+                    pool.submit(run_method, 'genetic_algorithm_generations', seeds[epoch * islands + island],
+                                dict(generation_arguments, population = populations[island], fitnesses = population_fitnesses[island],
+                                     num_generations = generations), budget, self.monitor.target)
+                    for island in range(islands)
+                ]
+                for island, future in enumerate(futures):
+                    (populations[island], population_fitnesses[island]), evaluations, target_reached_at = future.result()
+                    self.evaluations += evaluations     # We count the evaluations done by the workers too
+                    self.monitor.record_target(target_reached_at)
+                    self.monitor.record(min(population_fitnesses[island]), evaluations)
+
+                # No migration after the last epoch
+                if epoch < epochs - 1 and migrants > 0:
+                    self.migrate(populations, population_fitnesses, migrants, migration_topology)
+
+        return populations, population_fitnesses
+
+    # Sends the best migrants of every island to the islands it's connected to, where they replace the worst individuals
+    def migrate(self, populations: List[List[Tuple[List[int], List[List[int]]]]], population_fitnesses: List[List[int]],
+                migrants: int, migration_topology: str) -> None:
+        islands: int = len(populations)
+        # The elite of every island, picked before any island receives migrants
+        elites: List[List[int]] = [
+            sorted(range(len(fitnesses)), key = lambda ind: fitnesses[ind])[:migrants] for fitnesses in population_fitnesses
+        ]
+        outgoing: List[List[Tuple[Tuple[List[int], List[List[int]]], int]]] = [
+            [(populations[island][ind], population_fitnesses[island][ind]) for ind in elites[island]] for island in range(islands)
+        ]
+
+        for island in range(islands):
+            # Ring: every island receives from the previous one, fully connected: from all the other ones
+            if migration_topology == 'ring':
+                incoming = outgoing[(island - 1) % islands]
+            else:
+                incoming = [migrant for source in range(islands) if source != island for migrant in outgoing[source]]
+                incoming = sorted(incoming, key = lambda migrant: migrant[1])[:migrants]
+
+            fitnesses: List[int] = population_fitnesses[island]
+            worst: List[int] = sorted(range(len(fitnesses)), key = lambda ind: fitnesses[ind], reverse = True)[:len(incoming)]
+            for ind, (solution, makespan) in zip(worst, incoming):
+                populations[island][ind] = solution
+                fitnesses[ind] = makespan
 
     # Function for making a new solution out of 2 parent solution for the Genetic Algorithm
     def crossover(self, parent1: Tuple[List[int], List[List[int]]], 
@@ -534,110 +928,145 @@ class Scheduler:
             if (fitnesses[ind] < fitnesses[best_solution_index]):
                 best_solution_index = ind
 
-        # Return the best one as a parent
-        return copy.deepcopy(population[best_solution_index])
+        # Return the best one as a parent, no copy is needed since the offspring are always new solutions
+        return population[best_solution_index]
     
     
     # Here we implement the Iterated Local Search
-    def iterated_local_search(self,
-                    max_iterations: int = config.iterated_local_search.max_iterations,
-                    perturbation_strength: int = config.iterated_local_search.perturbation_strength
-                    ) -> Tuple[Tuple[List[int], List[List[int]]], int]:
-        
-         # Start with a deep copy of the initial solution to avoid modifying the input
+    def iterated_local_search(self, params: Optional[IteratedLocalSearch] = None) -> Tuple[Tuple[List[int], List[List[int]]], int]:
+        params = params if params is not None else config.iterated_local_search
+        neighborhood: str = params.neighborhood
+
+        # The current solution is modified in place by the moves, only the best solution is a copy
         current_solution: Tuple[List[int], List[List[int]]] = self.generate_dispaching_inititial_solution("MWR")
-        current_makespan: int = self.compute_makespan(*current_solution)    # Compute the makespan of the current solution
+        current_makespan: int = self.set_current_solution(current_solution)    # Compute the makespan of the current solution
         # Initialize the best solution and its makespan 
-        best_solution: Tuple[List[int], List[List[int]]] = copy.deepcopy(current_solution)
+        best_solution: Tuple[List[int], List[List[int]]] = copy_solution(current_solution)
         best_makespan: int = current_makespan
         
         
-        for i in range(max_iterations):
+        for i in range(params.max_iterations):
+            if self.monitor.should_stop():
+                break
             # Here we begin the local search
-            improved = config.iterated_local_search.improvement_tries # We'll give more chances for improvement
-            while improved > 0:
-                neighbour = self.generate_neighbor(current_solution)
-                neighbour_makespan = self.compute_makespan(*neighbour)
+            improved = params.improvement_tries # We'll give more chances for improvement
+            critical_moves: List[Union[SwapMove, InsertMove, ReassignMove]] = []    # The untried critical moves of the current solution
+            if neighborhood == 'critical':
+                critical_moves = self.critical_moves(current_solution)
+                random.shuffle(critical_moves)
+            while improved > 0 and not self.monitor.should_stop():
+                if neighborhood == 'critical':
+                    # First improvement over the critical neighbourhood, we stop when all the moves were tried without improvement
+                    if not critical_moves:
+                        break
+                    move = critical_moves.pop()
+                else:
+                    move = self.random_move(current_solution)
+                move.apply(current_solution)
+                neighbour_makespan = self.evaluate_move(current_solution, move)    # Evaluate it only from the first changed position
                 if neighbour_makespan < current_makespan:
-                    current_solution = copy.deepcopy(neighbour)
                     current_makespan = neighbour_makespan
+                    self.incremental.accept(current_solution[0])
                     if neighbour_makespan < best_makespan:
-                        best_solution = copy.deepcopy(neighbour)
+                        best_solution = copy_solution(current_solution)
                         best_makespan = neighbour_makespan
-                    improved = config.iterated_local_search.improvement_tries
+                    improved = params.improvement_tries
+                    if neighborhood == 'critical':
+                        critical_moves = self.critical_moves(current_solution)
+                        random.shuffle(critical_moves)
                 else:
+                    move.undo(current_solution)
                     improved -= 1
 
-            pertubed_solution: Tuple[List[int], List[List[int]]] = copy.deepcopy(current_solution)
-            # Perturbation step
-            for i in range(perturbation_strength):
-                pertubed_solution = self.generate_neighbor(pertubed_solution)
-            pertubed_solution_makespan: int = self.compute_makespan(*pertubed_solution)
+            # Perturbation step, the moves are applied in place and undone in reverse order if the perturbed solution is rejected
+            perturbation_moves: List[Union[SwapMove, InsertMove, ReassignMove]] = []
+            for i in range(params.perturbation_strength):
+                move = self.random_move(current_solution)
+                move.apply(current_solution)
+                perturbation_moves.append(move)
+            pertubed_solution_makespan: int = self.evaluate(*current_solution)
             # Check acceptance of perturbation
             if pertubed_solution_makespan < current_makespan:
-                current_solution = copy.deepcopy(pertubed_solution)
+                # It's already evaluated and counted, so it only becomes the base of the incremental evaluation
+                self.incremental.set_base(*current_solution)
                 current_makespan = pertubed_solution_makespan
+                if current_makespan < best_makespan:
+                    best_solution = copy_solution(current_solution)
+                    best_makespan = current_makespan
+            else:
+                for move in reversed(perturbation_moves):
+                    move.undo(current_solution)     # Back to the base solution of the incremental evaluation
 
         # Apply the best solution and return
-        self.compute_makespan(*best_solution)
+        self.materialize(*best_solution)
         return best_solution, best_makespan
     
 
 
-    def run(self, heuristic: str) -> None:
+    # The budget limits the run of the heuristics (the dispatching rules ignore it), None takes the value from global_configs and
+    # null in the config means no limit: time_limit in seconds, evaluation_limit in evaluations, stagnation_limit in evaluations
+    # without improving the best makespan. When any of them runs out the heuristic stops and applies the best solution it found
+    # progress_callback is called with (makespan, seconds, evaluations) every time a better makespan is found
+    # params are the parameters of the heuristic for this run (the same class as it's section of config.json), None uses config.json
+    def run(self, heuristic: str, time_limit: Optional[float] = None, evaluation_limit: Optional[int] = None,
+            stagnation_limit: Optional[int] = None, progress_callback: Optional[ProgressCallback] = None,
+            params: Optional[ConfigSection] = None) -> None:
+        if params is not None and (heuristic not in HEURISTIC_SECTIONS or type(params) is not type(default_params(heuristic))):
+            raise TypeError(f'{heuristic} can\'t be run with {type(params).__name__}')
+        # The monitor is restarted for this run, keeping the target set by the caller
+        self.monitor.start(self.monitor.target)
+        self.monitor.set_budget(
+            time_limit if time_limit is not None else self.settings.time_limit,
+            evaluation_limit if evaluation_limit is not None else self.settings.evaluation_limit,
+            stagnation_limit if stagnation_limit is not None else self.settings.stagnation_limit,
+            progress_callback
+        )
+        if self.instrumentation is not None:
+            self.instrumentation.start(heuristic)
+        try:
+            self.run_heuristic(heuristic, params)
+        finally:
+            self.monitor.set_budget()   # The budget was only for this run
+            if self.instrumentation is not None:
+                self.stats = self.instrumentation.finish()
+
+    # After this every run() saves it's call counts, phase times and counters to self.stats (the restarts and islands which run in
+    # worker processes are only counted in the evaluations), trace_memory also samples the peak memory but makes the run much slower
+    def enable_instrumentation(self, trace_memory: bool = False) -> None:
+        self.disable_instrumentation()
+        self.instrumentation = Instrumentation(self, trace_memory)
+        self.instrumentation.attach()
+
+    def disable_instrumentation(self) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
+            self.instrumentation = None
+
+    def run_heuristic(self, heuristic: str, params: Optional[ConfigSection] = None) -> None:
         # Executes the scheduling process based on the chosen heuristic
         if heuristic == "SA":
             # Use Simulated Annealing to optimize the schedule
-            best_solution, best_makespan = self.simulated_annealing()
+            best_solution, best_makespan = self.simulated_annealing(params)
             return
         elif heuristic == "HC":
             # Generate an initial solution for Hill Climbing
-            best_solution, best_makespan = self.hill_climbing()
+            best_solution, best_makespan = self.hill_climbing(params)
             return
         elif heuristic == "TS":
             # Generate an initial solution for Tabu Search
-            best_solution, best_makespan = self.tabu_search()
+            best_solution, best_makespan = self.tabu_search(params)
             return
         elif heuristic == "GA":
-            best_solution, best_makespan = self.genetic_algorithm()
+            best_solution, best_makespan = self.genetic_algorithm(params)
             return
         elif heuristic == "ILS":
-            best_solution, best_makespan = self.iterated_local_search()
+            best_solution, best_makespan = self.iterated_local_search(params)
             return
 
-        # Use dispatching rules for non heuristics
-        # Main scheduling loop - continues until all jobs are complete
-        while any(not job.is_complete() for job in self.jobs): # do until all the jobs are completed
-            # Get all available tasks sorted by the chosen heuristic
-            if(heuristic == 'SPT'):
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.shortest_processing_time()   # format: (job, task)
-            elif heuristic == 'LPT':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.longest_processing_time()    # format: (job, task)
-            elif heuristic == 'MWR':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.most_work_remaining()        # format: (job, task)
-            elif heuristic == 'LWR':
-                next_task_tuple: Optional[Tuple[Job, Task]] = self.least_work_remaining()       # format: (job, task)
-            else:
-                raise ValueError(f"Unknown heuristic: {heuristic}")
-            
-            if next_task_tuple:
-                job, task = next_task_tuple
-                machine: Machine = self.machines[task.machine_id]
-                # Schedule the task at the earliest possible time for this machine
-                start = machine.schedule[-1][2] if machine.schedule else 0  # Get the end time of the last machine's task or make it 0
-
-                # Now we pick the max between the possible start time of the machine computed above and the possible start time of the job (the possible
-                #   start time of the job is more or equal to when it's previous operation ended) because we need to satisfy both conditions
-                start = max(start, job.last_ending_time)
-
-                end = start + task.duration                                 # Calculate the end time
-                machine.add_to_schedule(job.job_id, start, end)             # Add the task to needed machine's schedule
-                task.start_time = start                                     # Update Task's start time
-                task.end_time = end                                         # Update Task's end time
-                self.global_max = max(self.global_max, end)                 # Update global makespan if needed
-                job.last_ending_time = task.end_time                        # Update the job's last ending time
-                job.complete_operation()                                    # Mark the task as done
-            
+        # Use dispatching rules for non heuristics, the engine builds the solution and we apply it to the jobs and machines
+        self.materialize(*dispatch(self.instance, heuristic))
+        self.monitor.record(self.global_max)    # The dispatching rules don't evaluate solutions, so we record the final makespan
+
     def print_machine_answer(self):
         for machine in self.machines:
             print(f'Machine id: {machine.machine_id}')
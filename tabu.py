@@ -0,0 +1,42 @@
+# TabuMemory keeps the tabu attributes of the recent moves in a hashed dictionary with the iteration when they stop being tabu
+# The attributes are small tuples, so checking a move is O(1) and the memory only depends on the tenure, not on the instance size
+from typing import Dict, Hashable, List, Tuple, Union
+
+from moves import InsertMove, ReassignMove, SwapMove
+
+
+class TabuMemory:
+    def __init__(self, tenure: int):
+        self.tenure: int = tenure
+        self.expiry: Dict[Hashable, int] = {}       # attribute -> first iteration when it's not tabu anymore
+
+    def is_tabu(self, attribute: Hashable, iteration: int) -> bool:
+        return self.expiry.get(attribute, 0) > iteration
+
+    def expiry_of(self, attribute: Hashable) -> int:
+        # The first iteration when the attribute is not tabu, 0 if it never was
+        return self.expiry.get(attribute, 0)
+
+    def add(self, attribute: Hashable, iteration: int) -> None:
+        self.expiry[attribute] = iteration + self.tenure + 1
+        # Every iteration adds one attribute, so from time to time we remove the expired ones to keep the memory bounded
+        if len(self.expiry) > 2 * self.tenure + 2:
+            self.expiry = {key: expiry for key, expiry in self.expiry.items() if expiry > iteration}
+
+
+# Returns the attributes of a move: the one checked to know if the move is tabu, and the one which becomes tabu when the move is made
+# sequence_operations[position] is the global operation at that position of the current operation sequence
+def move_attributes(move: Union[SwapMove, InsertMove, ReassignMove], sequence_operations: List[int], job_offsets: List[int],
+                    machine_assignment: List[List[int]]) -> Tuple[Hashable, Hashable]:
+    if isinstance(move, ReassignMove):
+        # Moving the operation back to it's old machine becomes tabu
+        global_operation: int = job_offsets[move.job_id] + move.operation_index
+        return ('assign', global_operation, move.machine_id), ('assign', global_operation, machine_assignment[move.job_id][move.operation_index])
+
+    # Swaps and insertions change the order of a pair of operations, exchanging the same pair again becomes tabu
+    if isinstance(move, SwapMove):
+        first, second = sequence_operations[move.first], sequence_operations[move.second]
+    else:
+        first, second = sequence_operations[move.source], sequence_operations[move.target]
+    attribute: Tuple[str, int, int] = ('pair', min(first, second), max(first, second))
+    return attribute, attribute
@@ -0,0 +1,53 @@
+# The batch decoder must give the same makespans as the scalar decoder, and the scheduler must give them too without NumPy
+import os
+import random
+from typing import List, Tuple
+
+import pytest
+
+import scheduler as scheduler_module
+from configModels import GlobalConfigs
+from decoder import Decoder
+from instance import CompiledInstance
+from scheduler import Scheduler
+from test_incremental import ROOT, flexible_instance, github_instance, random_move, random_solution
+
+
+@pytest.mark.parametrize('instance_name', ['github', 'flexible'])
+def test_batch_decoder_matches_decoder(instance_name: str) -> None:
+    pytest.importorskip('numpy')
+    from batch_decoder import BatchDecoder
+
+    instance: CompiledInstance = github_instance() if instance_name == 'github' else flexible_instance()
+    decoder: Decoder = Decoder(instance)
+    generator: random.Random = random.Random(0)
+
+    # Random solutions, and the neighbours of one solution which only differ at a few positions like the groups of the heuristics
+    solutions: List[Tuple[List[int], List[List[int]]]] = [random_solution(instance, generator) for _ in range(200)]
+    base: Tuple[List[int], List[List[int]]] = solutions[0]
+    solutions += [random_move(instance, base, generator).neighbor(base) for _ in range(200)]
+    assert BatchDecoder(instance).evaluate(solutions) == [decoder.makespan(*solution) for solution in solutions]
+    # A single solution is a batch too
+    assert BatchDecoder(instance).evaluate(solutions[:1]) == [decoder.makespan(*solutions[0])]
+
+
+@pytest.mark.parametrize('with_numpy', [True, False])
+def test_scheduler_batches_match_decoder(with_numpy: bool, monkeypatch) -> None:
+    if with_numpy:
+        pytest.importorskip('numpy')
+    else:
+        # Like an installation without NumPy, where the import of batch_decoder fails
+        monkeypatch.setattr(scheduler_module, 'BatchDecoder', None)
+    # batch_threshold 1 sends every group to the batch decoder when there is one
+    scheduler: Scheduler = Scheduler.from_file(os.path.join(ROOT, 'dataset_github.txt'),
+                                               GlobalConfigs(operation_machine_ratio = 0.5, batch_threshold = 1))
+    assert (scheduler.batch_decoder is not None) == with_numpy
+    generator: random.Random = random.Random(1)
+
+    solutions: List[Tuple[List[int], List[List[int]]]] = [random_solution(scheduler.instance, generator) for _ in range(50)]
+    assert scheduler.evaluate_many(solutions) == [scheduler.decoder.makespan(*solution) for solution in solutions]
+
+    solution: Tuple[List[int], List[List[int]]] = solutions[0]
+    scheduler.set_current_solution(solution)
+    moves = [random_move(scheduler.instance, solution, generator) for _ in range(50)]
+    assert scheduler.evaluate_moves(solution, moves) == [scheduler.decoder.makespan(*move.neighbor(solution)) for move in moves]
@@ -0,0 +1,58 @@
+# With the semi-active decoder the cache key only depends on the order of the operations on every machine, so the solutions which share
+# a key must also share the makespan
+import random
+from typing import List, Tuple
+
+import pytest
+
+from decoder import Decoder
+from evaluation_cache import EvaluationCache
+from instance import CompiledInstance
+from test_incremental import flexible_instance, github_instance, random_solution
+
+
+def position_machines(instance: CompiledInstance, solution: Tuple[List[int], List[List[int]]]) -> List[int]:
+    # The machine of the operation at every position of the sequence
+    scheduled_tasks: List[int] = [0] * instance.num_jobs
+    machines: List[int] = []
+    for job_id in solution[0]:
+        machines.append(solution[1][job_id][scheduled_tasks[job_id]])
+        scheduled_tasks[job_id] += 1
+    return machines
+
+
+@pytest.mark.parametrize('instance_name', ['github', 'flexible'])
+def test_same_machine_orders_share_key_and_makespan(instance_name: str) -> None:
+    instance: CompiledInstance = github_instance() if instance_name == 'github' else flexible_instance()
+    decoder: Decoder = Decoder(instance)
+    cache: EvaluationCache = EvaluationCache(instance, 10)
+    generator: random.Random = random.Random(0)
+
+    tested: int = 0
+    for _ in range(50):
+        operation_sequence, machine_assignment = random_solution(instance, generator)
+        machines: List[int] = position_machines(instance, (operation_sequence, machine_assignment))
+        for position in range(len(operation_sequence) - 1):
+            if operation_sequence[position] == operation_sequence[position + 1]:
+                continue
+            # Two neighbouring operations of different jobs: swapping them keeps the order on every machine only when their machines differ
+            swapped: List[int] = operation_sequence[:]
+            swapped[position], swapped[position + 1] = swapped[position + 1], swapped[position]
+            same_orders: bool = machines[position] != machines[position + 1]
+            assert (cache.key(swapped, machine_assignment) == cache.key(operation_sequence, machine_assignment)) == same_orders
+            if same_orders:
+                assert decoder.makespan(swapped, machine_assignment) == decoder.makespan(operation_sequence, machine_assignment)
+                tested += 1
+    assert tested > 0
+
+
+def test_non_canonical_key_keeps_the_sequence() -> None:
+    # For the active decoder the interleaving of the machines matters, so only identical solutions share a key
+    instance: CompiledInstance = github_instance()
+    cache: EvaluationCache = EvaluationCache(instance, 10, canonical = False)
+    operation_sequence, machine_assignment = random_solution(instance, random.Random(0))
+    position: int = next(index for index in range(len(operation_sequence) - 1) if operation_sequence[index] != operation_sequence[index + 1])
+    swapped: List[int] = operation_sequence[:]
+    swapped[position], swapped[position + 1] = swapped[position + 1], swapped[position]
+    assert cache.key(operation_sequence, machine_assignment) == cache.key(operation_sequence[:], [jobs[:] for jobs in machine_assignment])
+    assert cache.key(swapped, machine_assignment) != cache.key(operation_sequence, machine_assignment)
@@ -0,0 +1,93 @@
+# The incremental evaluator must give the same makespans as the full decoder, whatever moves are applied, accepted or undone
+import os
+import random
+from typing import List, Tuple
+
+import pytest
+
+from decoder import Decoder, IncrementalEvaluator
+from instance import CompiledInstance
+from models import Job, Task
+from moves import InsertMove, ReassignMove, SwapMove
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def github_instance() -> CompiledInstance:
+    # The first line has the number of jobs and machines, every other line is a job: the number of operations, then for every
+    # operation the number of machines followed by (machine, duration) pairs
+    jobs: List[Job] = []
+    with open(os.path.join(ROOT, 'dataset_github.txt'), 'r') as file:
+        machines: int = int(file.readline().split()[1])
+        for line in file:
+            values: List[int] = [int(value) for value in line.split()]
+            if not values:
+                continue
+            operations: List[List[Task]] = []
+            index: int = 1
+            for _ in range(values[0]):
+                count: int = values[index]
+                operations.append([Task(values[index + 1 + 2 * task], values[index + 2 + 2 * task]) for task in range(count)])
+                index += 1 + 2 * count
+            jobs.append(Job(len(jobs), operations))
+    return CompiledInstance(jobs, machines)
+
+
+def flexible_instance() -> CompiledInstance:
+    # A small random instance where most operations have several machines, so the reassignments are tested too
+    generator: random.Random = random.Random(3)
+    machines: int = 5
+    jobs: List[Job] = [
+        Job(job_id, [[Task(machine, generator.randint(1, 20)) for machine in generator.sample(range(machines), generator.randint(1, 3))]
+                     for _ in range(6)])
+        for job_id in range(12)
+    ]
+    return CompiledInstance(jobs, machines)
+
+
+def random_solution(instance: CompiledInstance, generator: random.Random) -> Tuple[List[int], List[List[int]]]:
+    operation_sequence: List[int] = [job_id for job_id in range(instance.num_jobs) for _ in range(instance.num_job_operations(job_id))]
+    generator.shuffle(operation_sequence)
+    machine_assignment: List[List[int]] = [
+        [generator.choice(instance.eligible_machines[global_operation])
+         for global_operation in range(instance.job_offsets[job_id], instance.job_offsets[job_id + 1])]
+        for job_id in range(instance.num_jobs)
+    ]
+    return operation_sequence, machine_assignment
+
+
+def random_move(instance: CompiledInstance, solution: Tuple[List[int], List[List[int]]], generator: random.Random):
+    size: int = len(solution[0])
+    kind: float = generator.random()
+    if kind < 0.4:
+        return SwapMove(*generator.sample(range(size), 2))
+    if kind < 0.7:
+        return InsertMove(*generator.sample(range(size), 2))
+    global_operation: int = generator.randrange(instance.num_operations)
+    job_id: int = instance.operation_job[global_operation]
+    return ReassignMove(job_id, global_operation - instance.job_offsets[job_id], generator.choice(instance.eligible_machines[global_operation]))
+
+
+@pytest.mark.parametrize('checkpoint_interval', [0, 1, 3, 7, 1000])
+@pytest.mark.parametrize('instance_name', ['github', 'flexible'])
+def test_evaluate_move_matches_decoder(instance_name: str, checkpoint_interval: int) -> None:
+    instance: CompiledInstance = github_instance() if instance_name == 'github' else flexible_instance()
+    decoder: Decoder = Decoder(instance)
+    incremental: IncrementalEvaluator = IncrementalEvaluator(instance, checkpoint_interval)
+    generator: random.Random = random.Random(checkpoint_interval)
+
+    solution: Tuple[List[int], List[List[int]]] = random_solution(instance, generator)
+    assert incremental.set_base(*solution) == decoder.makespan(*solution)
+    for step in range(1500):
+        move = random_move(instance, solution, generator)
+        move.apply(solution)
+        assert incremental.evaluate_move(solution, move) == decoder.makespan(*solution), f'step {step}: {type(move).__name__}'
+        # Half of the moves become the new base, the others are undone, so the checkpoints of both cases are tested
+        if generator.random() < 0.5:
+            incremental.accept(solution[0])
+        else:
+            move.undo(solution)
+        # A new base from time to time, like the restarts of the heuristics
+        if step % 500 == 499:
+            solution = random_solution(instance, generator)
+            assert incremental.set_base(*solution) == decoder.makespan(*solution)
@@ -0,0 +1,50 @@
+# Convergence traces: every new best makespan of a run is written as one JSON line, as soon as it's found, so the file can be
+# followed while the experiment runs and nothing is lost if it's stopped. A line looks like:
+#   {"instance": "dataset_github.txt", "algorithm": "TS", "repetition": 0, "seed": 42, "makespan": 1301, "evaluations": 850, "elapsed": 0.031}
+# The last line of every run is the final best with "final": true
+import json
+import os
+from typing import Dict, List, Optional, TextIO
+
+
+class ConvergenceTrace:
+    # A progress callback for Scheduler.run() which appends the improvements of one run to the trace file
+    def __init__(self, trace_path: str, instance: str, algorithm: str, repetition: int, seed: Optional[int]):
+        self.trace_path: str = trace_path
+        self.run: Dict = {'instance': instance, 'algorithm': algorithm, 'repetition': repetition, 'seed': seed}
+        self.file: Optional[TextIO] = None
+
+    def __enter__(self) -> 'ConvergenceTrace':
+        # Line buffered append, so every record is written with a single write and the workers can share the file
+        self.file = open(self.trace_path, 'a', buffering = 1)
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.file.close()
+        self.file = None
+
+    def __call__(self, makespan: int, elapsed: float, evaluations: int) -> None:
+        self.file.write(json.dumps(dict(self.run, makespan = makespan, evaluations = evaluations, elapsed = elapsed)) + '\n')
+
+    def end(self, makespan: int, elapsed: float, evaluations: int) -> None:
+        # The last line of a run has "final": true, it's written when the run ends so the charts show where the run plateaued
+        self.file.write(json.dumps(dict(self.run, makespan = makespan, evaluations = evaluations, elapsed = elapsed, final = True)) + '\n')
+
+
+def reset_trace(trace_path: str) -> None:
+    # Empties the trace file (and creates it's directory) before an experiment, the runs only append to it
+    directory: str = os.path.dirname(trace_path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    open(trace_path, 'w').close()
+
+
+def load_traces(trace_path: str) -> Dict[tuple, List[Dict]]:
+    # Returns the records grouped by run, the key is (instance, algorithm, repetition) and the records are in the order they were found
+    traces: Dict[tuple, List[Dict]] = {}
+    with open(trace_path, 'r') as file:
+        for line in file:
+            if line.strip():
+                record: Dict = json.loads(line)
+                traces.setdefault((record['instance'], record['algorithm'], record['repetition']), []).append(record)
+    return traces
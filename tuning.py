@@ -0,0 +1,105 @@
+# Parameter tuning of the heuristics: races parameter configurations across instances and drops the poor ones early (successive halving)
+# In every round all the remaining configurations run once on every instance, with the same seeds (so they are compared on the same
+# random numbers), and only the best keep_fraction of them go to the next round. The score of a configuration is it's mean gap to
+# the lower bound of the instances over all it's runs, so instances of different sizes weigh the same
+# The runs of a round are spread over a process pool, every worker keeps one Scheduler per instance
+import csv
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from configModels import ConfigSection
+from experiments import cell_seed, run_cell
+
+TUNING_FIELDS: List[str] = ['rank', 'params', 'runs', 'mean_gap', 'mean_makespan', 'rounds']
+
+
+def parameter_grid(base: ConfigSection, grid: Dict[str, List[Any]]) -> List[ConfigSection]:
+    # Every combination of the values of the grid, the other parameters are the ones of base, the invalid combinations are skipped
+    names: List[str] = list(grid)
+    candidates: List[ConfigSection] = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        try:
+            candidates.append(base.replace(**dict(zip(names, values))))
+        except (TypeError, ValueError) as error:
+            print(f'Skipped {dict(zip(names, values))}: {error}')
+    return candidates
+
+
+def tune(algorithm: str, candidates: List[ConfigSection], instance_paths: List[str], rounds: int, workers: int, master_seed: int,
+         keep_fraction: float = 0.5, evaluation_limit: Optional[int] = None) -> List[Dict]:
+    # Returns one row per candidate, the best first: the candidates dropped later are ranked before the ones dropped earlier,
+    # and the ones dropped in the same round by their score
+    gaps: List[List[float]] = [[] for _ in candidates]           # The gaps of the runs of every candidate
+    makespans: List[List[int]] = [[] for _ in candidates]
+    last_round: List[int] = [0] * len(candidates)                # The last round every candidate ran in
+    alive: List[int] = list(range(len(candidates)))
+
+    def score(index: int) -> float:
+        return sum(gaps[index]) / len(gaps[index])
+
+    pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(max_workers = workers) if workers > 1 else None
+    try:
+        for round_index in range(rounds):
+            # The seed of a run depends on the instance and the round only, so all the candidates get the same ones
+            cells = [
+                (index, (instance_path, algorithm, round_index, cell_seed(master_seed, instance_path, f'tune-{algorithm}', round_index)))
+                for index in alive for instance_path in instance_paths
+            ]
+            print(f'Round {round_index + 1}: {len(alive)} configuration(s), {len(cells)} runs on {workers} worker(s)...')
+            arguments: Dict = {'evaluation_limit': evaluation_limit}
+            if pool is not None:
+                futures = [pool.submit(run_cell, *cell, params = candidates[index], **arguments) for index, cell in cells]
+                rows: List[Dict] = [future.result() for future in futures]
+            else:
+                rows = [run_cell(*cell, params = candidates[index], **arguments) for index, cell in cells]
+
+            for (index, _), row in zip(cells, rows):
+                gaps[index].append((row['makespan'] - row['lower_bound']) / row['lower_bound'] if row['lower_bound'] else 0.0)
+                makespans[index].append(row['makespan'])
+                last_round[index] = round_index
+
+            # Successive halving, the best keep_fraction of the candidates survive (at least one)
+            alive.sort(key = score)
+            if round_index < rounds - 1:
+                alive = alive[:max(1, math.ceil(len(alive) * keep_fraction))]
+            if len(alive) == 1:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    ranking: List[int] = sorted(range(len(candidates)), key = lambda index: (-last_round[index], index not in alive, score(index)))
+    return [
+        {
+            'rank': rank + 1,
+            'params': candidates[index].as_dict(),
+            'runs': len(gaps[index]),
+            'mean_gap': score(index),
+            'mean_makespan': sum(makespans[index]) / len(makespans[index]),
+            'rounds': last_round[index] + 1
+        }
+        for rank, index in enumerate(ranking)
+    ]
+
+
+def save_tuning(ranking: List[Dict], results_path: str) -> None:
+    directory: str = os.path.dirname(results_path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+    with open(results_path, 'w', newline = '') as file:
+        writer = csv.DictWriter(file, fieldnames = TUNING_FIELDS)
+        writer.writeheader()
+        # The parameters are nested, so in the CSV they are saved as a JSON string
+        writer.writerows(dict(row, params = json.dumps(row['params'])) for row in ranking)
+
+
+def print_tuning(ranking: List[Dict], grid: Dict[str, List[Any]]) -> None:
+    # Only the tuned parameters are shown, the others are the same for all the candidates
+    print(f'{"Rank":>4} {"Mean gap":>9} {"Mean":>10} {"Runs":>5} {"Rounds":>6}   Parameters')
+    for row in ranking:
+        tuned: str = ', '.join(f'{name}={row["params"][name]}' for name in grid)
+        print(f'{row["rank"]:>4} {row["mean_gap"]:>9.2%} {row["mean_makespan"]:>10.1f} {row["runs"]:>5} {row["rounds"]:>6}   {tuned}')
@@ -1,12 +1,16 @@
-import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
-from typing import Dict, List
+# The plotting libraries (pandas, plotly, matplotlib) are imported inside the functions which draw, so the solver can be imported
+# and run headless without them and the runs which don't make charts don't pay for importing them
+import os
+from typing import Dict, List, Optional
 
+from experiments import load_results
+from traces import load_traces
 from scheduler import Scheduler
 
 
 def run_gannt_chart(heuristic: str, scheduler: Scheduler, heuristic_names: Dict):
+    import pandas as pd
+    import plotly.express as px
     scheduler.run(heuristic)
     print(f"\nResults for {heuristic}:")
     scheduler.print_job_answer()
@@ -78,29 +82,117 @@ def run_gannt_chart(heuristic: str, scheduler: Scheduler, heuristic_names: Dict)
     scheduler.reset_scheduler()
 
 
-def save_chart_results(heuristic: str, nr_iterations: int, optimal_result: int, scheduler: Scheduler, heuristic_names: Dict):
-    print(f'Plotting with {nr_iterations} iterations for {heuristic_names[heuristic]} running...')
-    makespans: List[int] = []
-    best_makespan: int = 1000000000 # We pick a billion as maximum bc there's no int limit in python
-    for i in range(nr_iterations):
-        scheduler.run(heuristic)
-        makespans.append(scheduler.get_makespan())
-        best_makespan = min(best_makespan, scheduler.get_makespan())
-        scheduler.reset_scheduler()
-
-    optimal_result_plot_line: List[int] = [optimal_result] * nr_iterations
-
-    # Plotting
-    plt.figure(figsize=(10, 6))
-    plt.plot(range(1, nr_iterations + 1), makespans, label = f'{heuristic_names[heuristic]}, (Best makespan: {best_makespan})', marker='o')
-    plt.plot(range(1, nr_iterations + 1), optimal_result_plot_line, label = f'Constant {optimal_result}', linestyle='--', color='red')
-    plt.xlabel('Iteration')
-    plt.ylabel('Makespan')
-    plt.title(f'Makespan over {nr_iterations} Runs for {heuristic_names[heuristic]}')
-    plt.legend()
-    plt.grid(True)
-
-    # Save the plot to the results folder
-    plt.savefig(f'results/{heuristic}_makespan.png')
+# Makes a chart of the makespans of every run for every algorithm and instance, from a results file written by the experiment runner
+# The reference line of every instance is it's lower bound, so the labels show the gap of the best makespan to it
+# (the results saved before the lower bounds were added have none, then only the makespans are drawn)
+def save_results_charts(results_path: str, heuristic_names: Dict):
+    import matplotlib.pyplot as plt
+    results: List[Dict] = load_results(results_path)
+    instances: List[str] = sorted({row['instance'] for row in results})
+    algorithms: List[str] = list(dict.fromkeys(row['algorithm'] for row in results))     # Keeps the order of the runs
+    lower_bounds: Dict[str, Optional[int]] = {row['instance']: row.get('lower_bound') for row in results}
+
+    for heuristic in algorithms:
+        plt.figure(figsize=(10, 6))
+        nr_iterations: int = 0
+        for index, instance in enumerate(instances):
+            rows: List[Dict] = sorted((row for row in results if row['algorithm'] == heuristic and row['instance'] == instance),
+                                      key = lambda row: row['repetition'])
+            if not rows:
+                continue
+            makespans: List[int] = [row['makespan'] for row in rows]
+            nr_iterations = max(nr_iterations, len(rows))
+            bound: Optional[int] = lower_bounds[instance]
+            if bound is None:
+                plt.plot(range(1, len(rows) + 1), makespans, label = f'{instance}, (Best makespan: {min(makespans)})',
+                         marker='o', color = f'C{index % 10}')
+                continue
+            gap: float = (min(makespans) - bound) / bound if bound else 0.0
+            plt.plot(range(1, len(rows) + 1), makespans, label = f'{instance}, (Best makespan: {min(makespans)}, gap to LB: {gap:.1%})',
+                     marker='o', color = f'C{index % 10}')
+            plt.axhline(bound, label = f'{instance} lower bound {bound}', linestyle='--', color = f'C{index % 10}')
+
+        plt.xlabel('Iteration')
+        plt.ylabel('Makespan')
+        plt.title(f'Makespan over {nr_iterations} Runs for {heuristic_names[heuristic]}')
+        plt.legend()
+        plt.grid(True)
+
+        # Save the plot to the results folder
+        plt.savefig(f'results/{heuristic}_makespan.png')
+        plt.close()
+        print(f'Plot with {nr_iterations} iterations for {heuristic_names[heuristic]} saved.')
+
+
+# Makes a chart of the mean time spent in every instrumented method by every algorithm and prints the other statistics,
+# from a results file written by the experiment runner with the instrumentation enabled
+def save_stats_charts(results_path: str, heuristic_names: Dict):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    results: List[Dict] = [row for row in load_results(results_path) if row.get('stats')]
+    if not results:
+        print('No statistics in the results, enable the instrumentation to get them.')
+        return
+    algorithms: List[str] = list(dict.fromkeys(row['algorithm'] for row in results))
+
+    # Mean seconds per run of every method, one column per algorithm
+    mean_times: Dict[str, Dict[str, float]] = {}
+    print(f'{"Algorithm":<10} {"Runs":>5} {"Evaluations":>12} {"Eval/s":>10} {"Accepted":>9} {"Cache hits":>11} {"Peak memory":>12}')
+    for heuristic in algorithms:
+        stats: List[Dict] = [row['stats'] for row in results if row['algorithm'] == heuristic]
+        methods: List[str] = sorted({method for run in stats for method in run['times']})
+        mean_times[heuristic_names[heuristic]] = {method: sum(run['times'].get(method, 0.0) for run in stats) / len(stats) for method in methods}
+
+        evaluations: int = sum(run['counters'].get('evaluations', 0) for run in stats)
+        wall_time: float = sum(run['wall_time'] for run in stats)
+        rates: List[float] = [run['acceptance_rate'] for run in stats if run['acceptance_rate'] is not None]
+        hits: int = sum(run['counters'].get('cache_hits', 0) for run in stats)
+        lookups: int = hits + sum(run['counters'].get('cache_misses', 0) for run in stats)
+        memories: List[int] = [run['peak_memory'] for run in stats if run['peak_memory'] is not None]
+        print(f'{heuristic:<10} {len(stats):>5} {evaluations / len(stats):>12.0f} {evaluations / wall_time if wall_time > 0 else 0:>10.0f} '
+              f'{f"{sum(rates) / len(rates):.1%}" if rates else "-":>9} {f"{hits / lookups:.1%}" if lookups else "-":>11} '
+              f'{f"{max(memories) / 1024 ** 2:.1f} MB" if memories else "-":>12}')
+
+    df = pd.DataFrame(mean_times).fillna(0.0)
+    df.plot(kind = 'barh', figsize = (10, 8))
+    plt.xlabel('Mean seconds per run (inclusive)')
+    plt.title('Time spent in the scheduler methods')
+    plt.grid(True, axis = 'x')
+    plt.tight_layout()
+    plt.savefig('results/phase_times.png')
     plt.close()
-    print(f'Plot with {nr_iterations} iterations for {heuristic_names[heuristic]} saved.')
\ No newline at end of file
+    print('Phase times chart saved.')
+
+
+# Overlays the convergence traces of all the algorithms and runs, one chart per instance, x_axis is 'evaluations' or 'elapsed' (seconds)
+# Every run is a step line of it's best makespan, the runs of the same algorithm have the same color
+# lower_bounds optionally gives the lower bound of every instance, drawn as a reference line
+def save_convergence_charts(trace_path: str, heuristic_names: Dict, x_axis: str = 'evaluations', lower_bounds: Optional[Dict[str, int]] = None):
+    import matplotlib.pyplot as plt
+    traces: Dict[tuple, List[Dict]] = load_traces(trace_path)
+    instances: List[str] = sorted({instance for instance, _, _ in traces})
+    algorithms: List[str] = list(dict.fromkeys(algorithm for _, algorithm, _ in traces))
+    colors: Dict[str, str] = {algorithm: f'C{index % 10}' for index, algorithm in enumerate(algorithms)}
+
+    for instance in instances:
+        plt.figure(figsize=(10, 6))
+        for algorithm in algorithms:
+            runs: List[List[Dict]] = [records for (run_instance, run_algorithm, _), records in traces.items()
+                                      if run_instance == instance and run_algorithm == algorithm]
+            for index, records in enumerate(runs):
+                # Only the first run of an algorithm gets a label, so the legend has one entry per algorithm
+                label: Optional[str] = f'{heuristic_names.get(algorithm, algorithm)} ({len(runs)} runs)' if index == 0 else None
+                plt.step([max(record[x_axis], 1e-6) for record in records], [record['makespan'] for record in records],
+                         where = 'post', color = colors[algorithm], alpha = 0.6, label = label)
+        if lower_bounds and instance in lower_bounds:
+            plt.axhline(lower_bounds[instance], linestyle='--', color='red', label = f'Lower bound {lower_bounds[instance]}')
+        plt.xscale('log')   # The improvements are fast at the beginning, so a log scale shows both ends of the runs
+        plt.xlabel('Evaluations' if x_axis == 'evaluations' else 'Seconds')
+        plt.ylabel('Best makespan')
+        plt.title(f'Convergence on {instance}')
+        plt.legend()
+        plt.grid(True)
+
+        plt.savefig(f'results/{os.path.splitext(instance)[0]}_convergence_{x_axis}.png')
+        plt.close()
+        print(f'Convergence chart for {instance} saved.')